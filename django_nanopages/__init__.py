@@ -1,5 +1,6 @@
 from .pages import Pages  # noqa
 from .page import Page  # noqa
+from .info import PageInfo  # noqa
 from .views import PageView  # noqa
 
 __version__ = "0.3.3"
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+#: Default memory budget for a Pages cache, in bytes
+DEFAULT_CACHE_SIZE = 32 * 1024 * 1024
+
+
+def sizeof(value: Any) -> int:
+    """
+    Estimate the memory used by a cached value, in bytes.
+
+    Follows the containers we cache (dicts, lists and tuples); other objects are
+    measured shallowly.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sizeof(key) + sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sizeof(item) for item in value)
+    return size
+
+
+class PageCache:
+    """
+    Thread-safe in-memory LRU cache, limited by the total size of its values in bytes.
+
+    Each entry is stored with a validation token (usually the source file's mtime and
+    size); a lookup with a different token is a miss, and the stale entry is dropped.
+
+    Entries can be frozen into a read-only dict, eg before forking workers. Frozen
+    entries are checked first, without taking the lock, reordering entries or counting
+    hits, so lookups don't write to memory shared between workers.
+    """
+
+    #: Maximum total size of cached values, in bytes
+    max_size: int
+
+    #: Maximum size of a single value, in bytes - larger values are not cached
+    max_item_size: int
+
+    #: Current total size of cached values, in bytes, including frozen values
+    size: int
+
+    #: Total size of frozen values, in bytes
+    frozen_size: int
+
+    def __init__(
+        self, max_size: int = DEFAULT_CACHE_SIZE, max_item_size: int | None = None
+    ):
+        """
+        Args:
+            max_size (int):
+                Memory budget in bytes. Use ``0`` to disable caching.
+            max_item_size (int, None):
+                Largest value which will be admitted to the cache, in bytes.
+                Defaults to a quarter of ``max_size``.
+        """
+        if max_item_size is None:
+            max_item_size = max_size // 4
+
+        self.max_size = max_size
+        self.max_item_size = min(max_item_size, max_size)
+        self.size = 0
+        self.frozen_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+        self._entries: OrderedDict[Hashable, tuple[Hashable, Any, int]] = OrderedDict()
+        self._frozen: dict[Hashable, tuple[Hashable, Any, int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._frozen)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._frozen or key in self._entries
+
+    def get(self, key: Hashable, token: Hashable = None) -> Any | None:
+        """
+        Return the cached value for ``key``, or None if missing or stale
+        """
+        frozen = self._frozen.get(key)
+        if frozen is not None and frozen[0] == token:
+            return frozen[1]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry[0] != token:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(
+        self, key: Hashable, value: Any, token: Hashable = None, size: int | None = None
+    ) -> bool:
+        """
+        Cache ``value`` under ``key``, evicting least recently used entries to fit.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            token: Validation token which must match on ``get``
+            size: Size of the value in bytes, if known; otherwise estimated
+
+        Returns:
+            True if the value was cached, False if it was too large to admit
+        """
+        if size is None:
+            size = sizeof(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            if size > self.max_item_size:
+                self.rejections += 1
+                return False
+
+            # Frozen entries can't be evicted, but count towards the budget
+            while self._entries and self.size + size > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            self._entries[key] = (token, value, size)
+            self.size += size
+            return True
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if key in self._frozen:
+                # Replace rather than modify, for lookups outside the lock
+                frozen = dict(self._frozen)
+                _, _, size = frozen.pop(key)
+                self._frozen = frozen
+                self.size -= size
+                self.frozen_size -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._frozen = {}
+            self.size = 0
+            self.frozen_size = 0
+
+    def freeze(self) -> None:
+        """
+        Move all entries into the read-only dict of frozen entries
+        """
+        with self._lock:
+            frozen = dict(self._frozen)
+            for key, entry in self._entries.items():
+                previous = frozen.get(key)
+                if previous is not None:
+                    self.frozen_size -= previous[2]
+                    self.size -= previous[2]
+                frozen[key] = entry
+                self.frozen_size += entry[2]
+            self._entries.clear()
+            self._frozen = frozen
+
+    def stats(self) -> dict[str, int]:
+        """
+        Report current usage, for sizing worker memory
+        """
+        with self._lock:
+            return {
+                "size": self.size,
+                "max_size": self.max_size,
+                "max_item_size": self.max_item_size,
+                "entries": len(self._entries) + len(self._frozen),
+                "frozen": len(self._frozen),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "rejections": self.rejections,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self.size -= size
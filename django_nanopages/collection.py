@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import operator
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, overload
+
+from .nav import sort_key
+
+
+if TYPE_CHECKING:
+    from .page import Page
+    from .pages import Pages
+
+
+#: Filter lookups, as ``field__lookup=value``
+LOOKUPS: dict[str, Callable[[Any, Any], bool]] = {
+    "exact": operator.eq,
+    "ne": operator.ne,
+    "lt": lambda value, arg: value is not None and sort_key(value) < sort_key(arg),
+    "lte": lambda value, arg: value is not None and sort_key(value) <= sort_key(arg),
+    "gt": lambda value, arg: value is not None and sort_key(value) > sort_key(arg),
+    "gte": lambda value, arg: value is not None and sort_key(value) >= sort_key(arg),
+    "in": lambda value, arg: value in arg,
+    "contains": lambda value, arg: isinstance(value, (str, list, tuple, dict))
+    and arg in value,
+}
+
+
+class PageCollection:
+    """
+    Lazy, sliceable collection of pages, for listings
+
+    Filtering and ordering use cached frontmatter field values, and the matching
+    request paths are cached on the Pages object; Page objects are only created for
+    the pages which are accessed. Works with Django's ``Paginator``.
+    """
+
+    #: The Pages instance
+    pages: Pages
+
+    #: Request path of the section - only pages below it are included
+    section: str
+
+    #: Filters, as a tuple of ``(field, lookup, value)``
+    filters: tuple[tuple[str, str, Any], ...]
+
+    #: Ordering, as a tuple of field names, with ``-`` prefix for descending
+    ordering: tuple[str, ...]
+
+    def __init__(
+        self,
+        pages: Pages,
+        section: str = "",
+        filters: tuple[tuple[str, str, Any], ...] = (),
+        ordering: tuple[str, ...] = (),
+    ):
+        self.pages = pages
+        self.section = section.strip("/")
+        self.filters = filters
+        self.ordering = ordering
+
+    def __repr__(self) -> str:
+        return f"<PageCollection: {self.section or '/'}>"
+
+    def _clone(self, **kwargs) -> PageCollection:
+        attrs = {
+            "section": self.section,
+            "filters": self.filters,
+            "ordering": self.ordering,
+            **kwargs,
+        }
+        return type(self)(self.pages, **attrs)
+
+    def filter(self, **kwargs) -> PageCollection:
+        """
+        Return a new collection of pages with matching frontmatter values.
+
+        Use ``field=value`` for an exact match, or ``field__lookup=value`` where
+        ``lookup`` is one of ``exact``, ``ne``, ``lt``, ``lte``, ``gt``, ``gte``,
+        ``in`` or ``contains``. ``title``, ``request_path``, ``mtime`` and ``size`` are
+        also available as fields.
+        """
+        filters = list(self.filters)
+        for key, value in kwargs.items():
+            field, _, lookup = key.partition("__")
+            lookup = lookup or "exact"
+            if lookup not in LOOKUPS:
+                raise ValueError(f"Unknown filter lookup {lookup}")
+            if isinstance(value, (list, set)):
+                # Make hashable so the result can be cached
+                value = tuple(value)
+            filters.append((field, lookup, value))
+        return self._clone(filters=tuple(filters))
+
+    def order_by(self, *fields: str) -> PageCollection:
+        """
+        Return a new collection ordered by the given fields.
+
+        Prefix a field with ``-`` for descending order. Pages without a value are
+        always last.
+        """
+        return self._clone(ordering=fields)
+
+    @property
+    def ordered(self) -> bool:
+        return bool(self.ordering)
+
+    @property
+    def request_paths(self) -> tuple[str, ...]:
+        """
+        Request paths of matching pages, in order
+        """
+        return self.pages.get_collection_paths(self)
+
+    def count(self) -> int:
+        return len(self.request_paths)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.request_paths)
+
+    def __iter__(self) -> Iterator[Page]:
+        for request_path in self.request_paths:
+            page = self.pages.get_page(request_path)
+            if page is not None:
+                yield page
+
+    @overload
+    def __getitem__(self, index: int) -> Page: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Page]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                page
+                for request_path in self.request_paths[index]
+                if (page := self.pages.get_page(request_path)) is not None
+            ]
+
+        page = self.pages.get_page(self.request_paths[index])
+        if page is None:
+            raise IndexError(index)
+        return page
+
+    def get_fields(self) -> set[str]:
+        """
+        Names of all fields used to filter and order this collection
+        """
+        fields = {field for field, _, _ in self.filters}
+        fields.update(field.lstrip("-") for field in self.ordering)
+        return fields
+
+    def resolve(
+        self, values: dict[str, dict[str, Any]], index: Iterable[str] | None = None
+    ) -> tuple[str, ...]:
+        """
+        Find the request paths of matching pages, in order
+
+        Args:
+            values: Field values for every page, as ``{field: {request_path: value}}``
+            index: Request paths of all pages - defaults to the current page index
+        """
+        if index is None:
+            index = self.pages.index
+        prefix = f"{self.section}/" if self.section else ""
+        request_paths = [
+            request_path
+            for request_path in index
+            if request_path.startswith(prefix) and request_path != self.section
+        ]
+
+        for field, lookup, arg in self.filters:
+            test = LOOKUPS[lookup]
+            field_values = values[field]
+            request_paths = [
+                request_path
+                for request_path in request_paths
+                if test(field_values.get(request_path), arg)
+            ]
+
+        # Stable sort from the last field to the first, keeping missing values last
+        for field in reversed(self.ordering):
+            descending = field.startswith("-")
+            field_values = values[field.lstrip("-")]
+            present = [
+                path for path in request_paths if field_values.get(path) is not None
+            ]
+            missing = [path for path in request_paths if field_values.get(path) is None]
+            present.sort(
+                key=lambda path: sort_key(field_values[path]), reverse=descending
+            )
+            request_paths = present + missing
+
+        return tuple(request_paths)
+
+    def get_cache_key(self) -> tuple | None:
+        """
+        Return a key to cache the resolved request paths, or None if not hashable
+        """
+        key = (self.section, self.filters, self.ordering)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
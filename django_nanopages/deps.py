@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from django.template.base import UNKNOWN_SOURCE, Template
+
+
+#: Template origins rendered in the current context, when tracking
+_tracked: ContextVar[set[str] | None] = ContextVar("nanopages_templates", default=None)
+
+_original_render: Callable | None = None
+
+
+def install():
+    """
+    Wrap ``Template._render`` to record the origin of every template rendered while
+    tracking. This is the same hook Django's test runner uses to record templates.
+    """
+    global _original_render
+    if _original_render is not None:
+        return
+
+    _original_render = Template._render
+
+    def _render(self, context):
+        templates = _tracked.get()
+        if templates is not None and self.origin.name != UNKNOWN_SOURCE:
+            templates.add(self.origin.name)
+        return _original_render(self, context)
+
+    Template._render = _render
+
+
+@contextmanager
+def track_templates() -> Iterator[set[str]]:
+    """
+    Collect the origin names of all templates rendered within the block, including
+    those used by ``{% extends %}`` and ``{% include %}``
+    """
+    install()
+    templates: set[str] = set()
+    token = _tracked.set(templates)
+    try:
+        yield templates
+    finally:
+        _tracked.reset(token)
+
+
+def get_template_version(templates: Iterable[str]) -> tuple[int, ...]:
+    """
+    Return the modification times of templates, in order of their names. Changes if
+    any of the templates change.
+    """
+    version = []
+    for template in sorted(templates):
+        try:
+            version.append(os.stat(template).st_mtime_ns)
+        except OSError:
+            # Not a file, or removed
+            version.append(0)
+    return tuple(version)
+
+
+class TemplateDependencies:
+    """
+    Records the templates each page depends on, with a reverse map to find the
+    pages which depend on a template
+    """
+
+    #: Request path to the template origins it rendered
+    templates: dict[str, frozenset[str]]
+
+    #: Template origin to the request paths which rendered it
+    dependents: dict[str, set[str]]
+
+    def __init__(self):
+        self.templates = {}
+        self.dependents = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, request_path: str) -> bool:
+        return request_path in self.templates
+
+    def record(self, request_path: str, templates: set[str]):
+        """
+        Record the templates a page used when it was rendered
+        """
+        with self._lock:
+            self._discard(request_path)
+            self.templates[request_path] = frozenset(templates)
+            for template in templates:
+                self.dependents.setdefault(template, set()).add(request_path)
+
+    def discard(self, request_path: str):
+        with self._lock:
+            self._discard(request_path)
+
+    def _discard(self, request_path: str):
+        for template in self.templates.pop(request_path, ()):
+            dependents = self.dependents.get(template)
+            if dependents is not None:
+                dependents.discard(request_path)
+                if not dependents:
+                    del self.dependents[template]
+
+    def get_dependents(self, template: str | Path) -> set[str]:
+        """
+        Return the request paths of pages which rendered the template
+        """
+        return set(self.dependents.get(str(template), ()))
+
+    def get_version(self, request_path: str) -> tuple[int, ...] | None:
+        """
+        Return the modification times of the templates a page depends on, or None if
+        the page has not been recorded. Changes if any of its templates change.
+        """
+        templates = self.templates.get(request_path)
+        if templates is None:
+            return None
+        return get_template_version(templates)
+
+    def clear(self):
+        with self._lock:
+            self.templates.clear()
+            self.dependents.clear()
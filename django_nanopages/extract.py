@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+from xml.etree.ElementTree import Element
+
+import markdown
+from django.utils.html import escape
+from markdown.extensions import Extension
+from markdown.extensions.toc import slugify, unique
+from markdown.treeprocessors import Treeprocessor
+from markdown.util import HTML_PLACEHOLDER_RE
+
+
+#: Heading levels in the table of contents - the ``h1`` is usually the page title
+TOC_LEVELS = range(2, 7)
+
+#: Maximum number of words in an excerpt
+EXCERPT_WORDS = 50
+
+HEADING_TAGS = {f"h{level}": level for level in range(1, 7)}
+
+
+class Heading(NamedTuple):
+    """
+    A heading in a page
+    """
+
+    #: Heading level, 1 to 6
+    level: int
+
+    #: Heading text, without markup
+    text: str
+
+    #: Anchor id of the heading, or ``""`` if it isn't in the table of contents
+    id: str
+
+
+class PageData(NamedTuple):
+    """
+    Data extracted from the content of a markdown page while converting it to HTML
+    """
+
+    #: Table of contents, as a nested HTML list of links to the headings
+    toc: str
+
+    #: All headings, in order
+    headings: tuple[Heading, ...]
+
+    #: Number of words in the content
+    word_count: int
+
+    #: Text of the first paragraph, truncated to ``EXCERPT_WORDS`` words
+    excerpt: str
+
+
+#: Data for pages which aren't converted from markdown
+EMPTY_DATA = PageData("", (), 0, "")
+
+
+def get_text(element: Element) -> str:
+    """
+    Return the text of an element and its children, with whitespace collapsed
+    """
+    # Raw HTML is held in placeholders until after the tree is processed
+    text = HTML_PLACEHOLDER_RE.sub(" ", "".join(element.itertext()))
+    return " ".join(text.split())
+
+
+def get_excerpt(text: str, words: int = EXCERPT_WORDS) -> str:
+    """
+    Truncate text to a number of words
+    """
+    parts = text.split()
+    if len(parts) <= words:
+        return text
+    return " ".join(parts[:words]) + "…"
+
+
+def get_toc(headings: tuple[Heading, ...]) -> str:
+    """
+    Build a nested HTML list of links to the headings which have anchors
+    """
+    html = []
+    levels: list[int] = []
+    for heading in headings:
+        if not heading.id:
+            continue
+
+        if not levels or heading.level > levels[-1]:
+            html.append("<ul>")
+            levels.append(heading.level)
+        else:
+            html.append("</li>")
+            while len(levels) > 1 and heading.level < levels[-1]:
+                html.append("</ul></li>")
+                levels.pop()
+
+        html.append(f'<li><a href="#{escape(heading.id)}">{escape(heading.text)}</a>')
+
+    html.append("</li></ul>" * len(levels))
+    return "".join(html)
+
+
+class ExtractTreeprocessor(Treeprocessor):
+    """
+    Collect the page data from the element tree, and add anchor ids to the headings
+    in the table of contents
+    """
+
+    def run(self, root: Element):
+        used_ids = {element.get("id") for element in root.iter() if element.get("id")}
+        headings = []
+        excerpt = ""
+        for element in root.iter():
+            level = HEADING_TAGS.get(element.tag)
+            if level is not None:
+                text = get_text(element)
+                anchor = ""
+                if level in TOC_LEVELS:
+                    anchor = element.get("id") or unique(slugify(text, "-"), used_ids)
+                    element.set("id", anchor)
+                headings.append(Heading(level, text, anchor))
+
+            elif element.tag == "p" and not excerpt:
+                excerpt = get_excerpt(get_text(element))
+
+        headings = tuple(headings)
+        self.md.page_data = PageData(
+            toc=get_toc(headings),
+            headings=headings,
+            word_count=len(get_text(root).split()),
+            excerpt=excerpt,
+        )
+
+
+class ExtractExtension(Extension):
+    """
+    Markdown extension to extract ``PageData`` in the same pass as the conversion
+    """
+
+    def extendMarkdown(self, md: markdown.Markdown):
+        # After inline patterns have been applied
+        md.treeprocessors.register(ExtractTreeprocessor(md), "nanopages_extract", 5)
+
+
+def create_converter() -> markdown.Markdown:
+    """
+    Create a markdown converter which extracts ``PageData``
+    """
+    return markdown.Markdown(extensions=[ExtractExtension()])
+
+
+def convert(
+    body: str, converter: markdown.Markdown | None = None
+) -> tuple[str, PageData]:
+    """
+    Convert markdown to HTML and extract its page data in a single pass
+
+    Args:
+        body: The markdown
+        converter: A converter from ``create_converter()`` to reuse, or None to
+            create a new one
+    """
+    if converter is None:
+        converter = create_converter()
+    else:
+        converter.reset()
+
+    # Not set if the body is empty
+    converter.page_data = EMPTY_DATA
+    html = converter.convert(body)
+    return html, converter.page_data
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import datetime
+import hashlib
+from typing import TYPE_CHECKING, Any
+from xml.sax.saxutils import escape
+
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.encoding import iri_to_uri
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date
+from django.views import View
+
+
+if TYPE_CHECKING:
+    from .pages import Pages
+
+
+def to_datetime(value: Any, default: float) -> datetime.datetime:
+    """
+    Convert a frontmatter date value to a datetime, or use the default timestamp
+    """
+    if isinstance(value, datetime.datetime):
+        result = value
+    elif isinstance(value, datetime.date):
+        result = datetime.datetime(value.year, value.month, value.day)
+    elif isinstance(value, str):
+        result = parse_datetime(value)
+        if result is None:
+            date = parse_date(value)
+            result = (
+                datetime.datetime(date.year, date.month, date.day) if date else None
+            )
+    else:
+        result = None
+
+    if result is None:
+        return datetime.datetime.fromtimestamp(default, tz=datetime.timezone.utc)
+    if result.tzinfo is None:
+        result = result.replace(tzinfo=datetime.timezone.utc)
+    return result
+
+
+class CachedXMLView(View):
+    """
+    Base view for XML documents generated from the page index.
+
+    Documents are cached in the Pages cache until the pages are invalidated, and
+    support conditional GET with ``ETag`` and ``Last-Modified``.
+    """
+
+    #: Reference to the Pages object
+    pages: Pages | None = None
+
+    #: Response content type
+    content_type: str = "application/xml"
+
+    #: Absolute URL of the Pages root, set for each request
+    root_url: str
+
+    def get(self, request, **kwargs) -> HttpResponse:
+        if not self.pages:
+            raise ValueError("Cannot render without an associated Pages object")
+
+        # URLs are absolute, so the document depends on the host
+        self.root_url = request.build_absolute_uri(reverse(self.pages.name))
+        key = (type(self).__name__, self.root_url, tuple(kwargs.items()))
+        cached = self.pages.cache.get(key, self.pages.version)
+        if cached is None:
+            content, last_modified = self.render(**kwargs)
+            last_modified = int(last_modified)
+            etag = f'"{hashlib.md5(content.encode()).hexdigest()}"'
+            cached = (content, last_modified, etag)
+            self.pages.cache.set(key, cached, self.pages.version)
+
+        content, last_modified, etag = cached
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = HttpResponse(content, content_type=self.content_type)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def render(self, **kwargs) -> tuple[str, float]:
+        """
+        Generate the document
+
+        Returns:
+            Tuple of (XML content, last modified timestamp)
+        """
+        raise NotImplementedError()
+
+    def get_url(self, request_path: str) -> str:
+        """
+        Return the absolute URL of a page, without resolving each page separately
+        """
+        if not request_path:
+            return self.root_url
+        return f"{self.root_url}{iri_to_uri(request_path)}/"
+
+
+class SitemapView(CachedXMLView):
+    """
+    ``sitemap.xml`` for all pages.
+
+    If there are more than ``limit`` pages, ``sitemap.xml`` is a sitemap index which
+    links to ``sitemap-1.xml``, ``sitemap-2.xml`` etc.
+    """
+
+    #: Maximum number of URLs in one sitemap
+    limit: int = 50_000
+
+    def get_sections(self) -> int:
+        """
+        Return the number of sitemap files needed
+        """
+        return -(-len(self.pages.index) // self.limit)
+
+    def render(self, section: int | None = None) -> tuple[str, float]:
+        mtimes = self.pages.get_field_values(["mtime"])["mtime"]
+        last_modified = max(mtimes.values(), default=0)
+        num_sections = self.get_sections()
+
+        if section is None and num_sections > 1:
+            return self.render_index(num_sections), last_modified
+
+        if section is None:
+            section = 1
+        if not 1 <= section <= max(num_sections, 1):
+            raise Http404()
+
+        request_paths = list(mtimes)[(section - 1) * self.limit : section * self.limit]
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+        ]
+        for request_path in request_paths:
+            lastmod = datetime.datetime.fromtimestamp(
+                mtimes[request_path], tz=datetime.timezone.utc
+            )
+            lines.append(
+                f"<url><loc>{escape(self.get_url(request_path))}</loc>"
+                f"<lastmod>{lastmod.date().isoformat()}</lastmod></url>"
+            )
+        lines.append("</urlset>")
+
+        section_modified = max(
+            (mtimes[request_path] for request_path in request_paths), default=0
+        )
+        return "\n".join(lines), section_modified
+
+    def render_index(self, num_sections: int) -> str:
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+        ]
+        for section in range(1, num_sections + 1):
+            url = reverse(f"{self.pages.name}-sitemap", kwargs={"section": section})
+            location = self.request.build_absolute_uri(url)
+            lines.append(f"<sitemap><loc>{escape(location)}</loc></sitemap>")
+        lines.append("</sitemapindex>")
+        return "\n".join(lines)
+
+
+class FeedView(CachedXMLView):
+    """
+    Atom feed of the latest pages in a section.
+
+    Entries are ordered by their ``date`` frontmatter, or file modification time if
+    not set. The entry summary is taken from the ``summary`` frontmatter.
+    """
+
+    content_type = "application/atom+xml; charset=utf-8"
+
+    #: Request path of the section to include
+    section: str = ""
+
+    #: Title of the feed - defaults to the ``site_title`` in the Pages context
+    title: str | None = None
+
+    #: Maximum number of entries
+    limit: int = 50
+
+    def render(self) -> tuple[str, float]:
+        pages = self.pages
+        values = pages.get_field_values(["title", "date", "summary", "mtime"])
+        request_paths = pages.collection(self.section).request_paths
+
+        entries = sorted(
+            (
+                (
+                    to_datetime(values["date"][path], values["mtime"][path]),
+                    to_datetime(None, values["mtime"][path]),
+                    path,
+                )
+                for path in request_paths
+            ),
+            reverse=True,
+        )[: self.limit]
+
+        title = self.title or (pages.context or {}).get("site_title") or pages.name
+        feed = Atom1Feed(
+            title=title,
+            link=self.get_url(self.section),
+            description="",
+            feed_url=self.request.build_absolute_uri(),
+        )
+        for published, updated, request_path in entries:
+            url = self.get_url(request_path)
+            feed.add_item(
+                title=values["title"][request_path],
+                link=url,
+                description=values["summary"][request_path] or "",
+                unique_id=url,
+                pubdate=published,
+                updateddate=updated,
+            )
+
+        last_modified = max(
+            (values["mtime"][path] for _, _, path in entries), default=0
+        )
+        return feed.writeString("utf-8"), last_modified
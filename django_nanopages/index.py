@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from .sources import Source
+
+
+#: Page source suffixes, in order of precedence
+SUFFIXES = (".html", ".md")
+
+#: Section index filenames, in order of precedence
+INDEX_NAMES = tuple(f"index{suffix}" for suffix in SUFFIXES)
+
+
+def get_request_path(rel_path: str) -> tuple[str, int] | None:
+    """
+    Find the request path served by a source file.
+
+    Args:
+        rel_path: POSIX path of the source file, relative to the pages root
+
+    Returns:
+        Tuple of (request path, precedence), or None if the file is not a page. Where
+        several files map to the same request path, the lowest precedence is used, to
+        match the search order in ``Page.find_src``.
+    """
+    parent, _, filename = rel_path.rpartition("/")
+    if filename in INDEX_NAMES:
+        return parent, len(SUFFIXES) + INDEX_NAMES.index(filename)
+
+    stem, dot, suffix = filename.rpartition(".")
+    if not dot or not stem or f".{suffix}" not in SUFFIXES:
+        return None
+
+    request_path = f"{parent}/{stem}" if parent else stem
+    return request_path, SUFFIXES.index(f".{suffix}")
+
+
+class PageIndex(Mapping):
+    """
+    Immutable mapping of request paths to page source files
+    """
+
+    def __init__(self, entries: dict[str, Path]):
+        self._entries = entries
+
+    @classmethod
+    def build(cls, source: Source) -> PageIndex:
+        """
+        List the source files once and index every page
+
+        For an ``OverlaySource``, each layer is indexed separately and merged, so a
+        page in a later layer always replaces the page in an earlier one. The layer
+        each source file came from is recorded on the ``OverlaySource``.
+        """
+        from .sources import OverlaySource
+
+        if isinstance(source, OverlaySource):
+            indexes = []
+            for layer in source.sources:
+                index = cls.build(layer)
+                for src in index.values():
+                    source.set_owner(src, layer)
+                indexes.append(index)
+            return cls.merge(indexes)
+
+        entries: dict[str, Path] = {}
+        precedence: dict[str, int] = {}
+
+        for rel_path, src in source.scan():
+            found = get_request_path(rel_path)
+            if found is None:
+                continue
+
+            request_path, rank = found
+            if rank < precedence.get(request_path, len(SUFFIXES) * 2):
+                entries[request_path] = src
+                precedence[request_path] = rank
+
+        return cls(dict(sorted(entries.items())))
+
+    @classmethod
+    def merge(cls, indexes: Iterable[PageIndex]) -> PageIndex:
+        """
+        Merge indexes into one, with entries from later indexes replacing earlier ones
+        """
+        entries: dict[str, Path] = {}
+        for index in indexes:
+            entries.update(index._entries)
+        return cls(dict(sorted(entries.items())))
+
+    def __getitem__(self, request_path: str) -> Path:
+        return self._entries[request_path]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"<PageIndex: {len(self)} pages>"
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+from .extract import PageData
+from .page import get_title, read_frontmatter
+
+
+if TYPE_CHECKING:
+    from .sources import Source
+
+
+class PageInfo:
+    """
+    Compact immutable summary of a page, for listings over large numbers of pages.
+
+    Holds no body, context dict or reference to the ``Pages`` object; selected
+    frontmatter fields are available as attributes, eg ``info.date``. Fields can also
+    include the ``PageData`` extracted from markdown, eg ``info.word_count``.
+    """
+
+    __slots__ = ("request_path", "src", "mtime", "size", "title", "fields")
+
+    #: The path under the ``Pages`` root
+    request_path: str
+
+    #: The source file path, as a string
+    src: str
+
+    #: The source file modification time, as a timestamp
+    mtime: float
+
+    #: The source file size in bytes
+    size: int
+
+    #: The page title - see ``Page.title``
+    title: str
+
+    #: Selected frontmatter fields, as a tuple of ``(key, value)`` pairs
+    fields: tuple[tuple[str, Any], ...]
+
+    def __init__(
+        self,
+        request_path: str,
+        src: str,
+        mtime: float,
+        size: int,
+        title: str,
+        fields: tuple[tuple[str, Any], ...] = (),
+    ):
+        set_attr = object.__setattr__
+        set_attr(self, "request_path", request_path)
+        set_attr(self, "src", src)
+        set_attr(self, "mtime", mtime)
+        set_attr(self, "size", size)
+        set_attr(self, "title", title)
+        set_attr(self, "fields", fields)
+
+    @classmethod
+    def from_src(
+        cls,
+        source: Source,
+        request_path: str,
+        src: Path,
+        fields: Iterable[str] = (),
+        data: PageData | None = None,
+    ) -> PageInfo:
+        """
+        Build a PageInfo by reading the frontmatter of the source file
+
+        Args:
+            source: The Source containing the file
+            request_path: The path under the ``Pages`` root
+            src: The source file
+            fields: Names of frontmatter fields to keep. Missing fields are ``None``.
+            data: The page data, if any fields are ``PageData`` fields - these take
+                precedence over frontmatter fields with the same name.
+        """
+        mtime_ns, size = source.get_token(src)
+        with source.open(src) as file:
+            frontmatter = read_frontmatter(file)
+        if data is not None:
+            frontmatter.update(data._asdict())
+
+        return cls(
+            request_path=request_path,
+            src=str(src),
+            mtime=mtime_ns / 1_000_000_000,
+            size=size,
+            title=get_title(request_path.split("/")[-1], frontmatter),
+            fields=tuple((field, frontmatter.get(field)) for field in fields),
+        )
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("PageInfo is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("PageInfo is immutable")
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when the slot lookup fails
+        for key, value in object.__getattribute__(self, "fields"):
+            if key == name:
+                return value
+        raise AttributeError(name)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PageInfo):
+            return NotImplemented
+        return all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.src, self.mtime, self.size))
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, slot) for slot in self.__slots__))
+
+    def __repr__(self) -> str:
+        return f"<PageInfo: {self.request_path}>"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Return a selected frontmatter field
+        """
+        for field, value in self.fields:
+            if field == key:
+                return value
+        return default
@@ -31,12 +31,15 @@ def django_post_setup(app):
         re: bool = False,
         name: str | None = None,
         context: dict | None = None,
+        **kwargs,
     ) -> Pages:
         """
         django-nanopages integration
+
+        Additional keyword arguments are passed on to ``Pages``.
         """
 
-        pages = Pages(path, name=name, context=context)
+        pages = Pages(path, name=name, context=context, **kwargs)
         self.route(
             pattern,
             include=pages,
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from django.urls import reverse
+
+from .index import INDEX_NAMES
+
+
+if TYPE_CHECKING:
+    from .info import PageInfo
+    from .pages import Pages
+
+
+def sort_key(value: Any) -> tuple:
+    """
+    Return a key to sort frontmatter values of mixed types
+
+    Numbers (including numeric strings from plain frontmatter) sort before other values,
+    and missing values sort last.
+    """
+    if value is None:
+        return (2, "")
+    if isinstance(value, str) and value.lstrip("-").isdigit():
+        value = int(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, str(value))
+
+
+class NavNode:
+    """
+    A page in the navigation tree
+    """
+
+    __slots__ = ("info", "tree", "parent", "children", "prev", "next", "_url")
+
+    #: Summary of the page
+    info: PageInfo
+
+    #: The tree this node belongs to
+    tree: NavTree
+
+    #: The nearest ancestor page, or None for top-level pages
+    parent: NavNode | None
+
+    #: Child pages, in order
+    children: tuple[NavNode, ...]
+
+    #: The previous sibling, or None if this is the first
+    prev: NavNode | None
+
+    #: The next sibling, or None if this is the last
+    next: NavNode | None
+
+    def __init__(self, info: PageInfo, tree: NavTree):
+        self.info = info
+        self.tree = tree
+        self.parent = None
+        self.children = ()
+        self.prev = None
+        self.next = None
+        self._url = None
+
+    def __repr__(self) -> str:
+        return f"<NavNode: {self.request_path}>"
+
+    @property
+    def request_path(self) -> str:
+        return self.info.request_path
+
+    @property
+    def title(self) -> str:
+        return self.info.title
+
+    @property
+    def is_section(self) -> bool:
+        """
+        True if this page is a section index, ie an ``index.md`` or ``index.html``
+        """
+        return Path(self.info.src).name in INDEX_NAMES
+
+    @property
+    def siblings(self) -> tuple[NavNode, ...]:
+        """
+        Other pages with the same parent, in order
+        """
+        if self.parent is None:
+            nodes = self.tree.roots
+        else:
+            nodes = self.parent.children
+        return tuple(node for node in nodes if node is not self)
+
+    @property
+    def page(self):
+        """
+        The full Page object for this node
+        """
+        return self.tree.pages.get_page(self.request_path)
+
+    def get_absolute_url(self) -> str:
+        url = self._url
+        if url is None:
+            url = self._url = reverse(self.tree.pages.name, args=[self.request_path])
+        return url
+
+
+class NavTree:
+    """
+    Navigation tree of all pages, built from the page index and frontmatter
+    """
+
+    #: The Pages instance this tree was built for
+    pages: Pages
+
+    #: Top-level pages, in order - the root index and pages without an ancestor
+    roots: tuple[NavNode, ...]
+
+    #: All nodes by request path
+    nodes: dict[str, NavNode]
+
+    def __init__(self, pages: Pages, infos: list[PageInfo], order: str):
+        """
+        Args:
+            pages: The Pages instance
+            infos: Summaries of every page, with the ``order`` field
+            order: Frontmatter key to sort sibling pages by
+        """
+        self.pages = pages
+        self.nodes = {info.request_path: NavNode(info, self) for info in infos}
+
+        # Link each node to its nearest existing ancestor
+        roots: list[NavNode] = []
+        children: dict[str, list[NavNode]] = {}
+        for request_path, node in self.nodes.items():
+            parent = self.find_parent(request_path)
+            if parent is None:
+                roots.append(node)
+            else:
+                node.parent = parent
+                children.setdefault(parent.request_path, []).append(node)
+
+        self.roots = self.link(roots, order)
+        for request_path, nodes in children.items():
+            self.nodes[request_path].children = self.link(nodes, order)
+
+    def __repr__(self) -> str:
+        return f"<NavTree: {len(self.nodes)} pages>"
+
+    def __getitem__(self, request_path: str) -> NavNode:
+        return self.nodes[request_path]
+
+    def __contains__(self, request_path: str) -> bool:
+        return request_path in self.nodes
+
+    def get(self, request_path: str) -> NavNode | None:
+        return self.nodes.get(request_path)
+
+    def find_parent(self, request_path: str) -> NavNode | None:
+        if not request_path:
+            return None
+
+        while "/" in request_path:
+            request_path = request_path.rsplit("/", 1)[0]
+            if request_path in self.nodes:
+                return self.nodes[request_path]
+
+        return self.nodes.get("")
+
+    @staticmethod
+    def link(nodes: list[NavNode], order: str) -> tuple[NavNode, ...]:
+        """
+        Sort sibling nodes and link them to each other
+        """
+        nodes.sort(key=lambda node: (sort_key(node.info.get(order)), node.request_path))
+        for node, next_node in zip(nodes, nodes[1:]):
+            node.next = next_node
+            next_node.prev = node
+        return tuple(nodes)
@@ -1,14 +1,105 @@
 from __future__ import annotations
 
+import functools
 import json
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import IO, TYPE_CHECKING, Any
 
-import markdown
 from django.urls import reverse
+from django.utils.safestring import SafeString, mark_safe
+
+from .extract import EMPTY_DATA, Heading, PageData, convert
 
 if TYPE_CHECKING:
+    from .collection import PageCollection
+    from .nav import NavNode
     from .pages import Pages
+    from .sources import Source
+
+
+def get_title(name: str, context: dict[str, Any]) -> str:
+    """
+    Return the ``title`` from the context, or the page name in title case
+    """
+    title = context.get("title", None)
+    if title is not None:
+        return title
+    return name.replace("-", " ").replace("_", " ").title()
+
+
+#: Number of distinct parsed frontmatter blocks to cache
+FRONTMATTER_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=FRONTMATTER_CACHE_SIZE)
+def _parse_frontmatter(lang: str, raw_context: str) -> dict[str, Any]:
+    context: dict[str, Any] = {}
+    if lang == "":
+        for line in raw_context.splitlines():
+            if ":" in line:
+                key, value = line.split(":", 1)
+                context[key.strip()] = value.strip()
+            else:
+                context[line] = ""
+
+    elif lang == "json":
+        context.update(json.loads(raw_context))
+
+    elif lang in ["yml", "yaml"]:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Cannot load YAML context, PyYAML is not installed")
+
+        # Use libyaml if available, it is much faster
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        data = yaml.load(raw_context, Loader=loader)
+        if not isinstance(data, dict):
+            raise ValueError("Cannot load YAML context, not a dict")
+        context.update(data)
+
+    else:
+        raise ValueError(f"Unsupported context language {lang}")
+
+    return context
+
+
+def parse_frontmatter(lang: str, raw_context: str) -> dict[str, Any]:
+    """
+    Parse a frontmatter block.
+
+    Parsed blocks are cached by their raw content, so pages which share identical
+    frontmatter are only parsed once. Each call returns a new dict, but nested values
+    are shared and should not be modified.
+
+    Args:
+        lang: The frontmatter language - ``""`` for plain, ``json`` or ``yaml``
+        raw_context: The frontmatter, without the ``---`` delimiters
+
+    Raises:
+        ValueError: If the frontmatter cannot be parsed
+    """
+    return dict(_parse_frontmatter(lang, raw_context))
+
+
+def read_frontmatter(file: IO[str]) -> dict[str, Any]:
+    """
+    Read and parse the frontmatter from an open page source, without reading the body
+    """
+    lines = [file.readline()]
+    if not lines[0].startswith("---"):
+        return {}
+
+    for line in file:
+        lines.append(line)
+        if line.rstrip("\r\n") == "---":
+            break
+    else:
+        # Not valid frontmatter
+        return {}
+
+    _, frontmatter = Page.parse("".join(lines))
+    return frontmatter
 
 
 class Page:
@@ -18,17 +109,24 @@ class Page:
 
     request_path: str
     pages: Pages
+    source: Source
     extra_context: dict
     name: str
 
     _body: str | None = None
     _context: dict | None = None
+    _html: str | None = None
+    _data: PageData | None = None
+    _token: tuple[int, int] | None = None
 
     def __init__(
         self,
         request_path: str,
         pages: Pages,
         extra_context: dict[str, Any] | None = None,
+        *,
+        src: Path | None = None,
+        source: Source | None = None,
     ):
         """
         Initialize a Page with a request path.
@@ -37,13 +135,19 @@ class Page:
             request_path: The URL path being requested
             pages: The Pages instance containing configuration and root path
             extra_context: Additional context to merge with page frontmatter
+            src: The source file, if already known; otherwise it will be found
+            source: The source to read the page from. Defaults to the current source
+                of ``pages``, so the page keeps reading from it if a new release of
+                the pages is loaded.
         """
         self.request_path = request_path
         self.pages = pages
+        self.source = source if source is not None else pages.source
         self.extra_context = extra_context or {}
         self.name = request_path.split("/")[-1]
 
-        src = self.find_src()
+        if src is None:
+            src = self.find_src()
         if src is not None:
             self.exists = True
             self.src = src
@@ -53,10 +157,52 @@ class Page:
 
     @property
     def title(self) -> str:
-        title = self.context.get("title", None)
-        if title is not None:
-            return title
-        return self.name.replace("-", " ").replace("_", " ").title()
+        return get_title(self.name, self.context)
+
+    @property
+    def nav(self) -> NavNode | None:
+        """
+        This page's node in the navigation tree
+        """
+        return self.pages.nav.get(self.request_path)
+
+    @property
+    def parent(self) -> NavNode | None:
+        nav = self.nav
+        return nav.parent if nav else None
+
+    @property
+    def children(self) -> tuple[NavNode, ...]:
+        nav = self.nav
+        return nav.children if nav else ()
+
+    @property
+    def siblings(self) -> tuple[NavNode, ...]:
+        nav = self.nav
+        return nav.siblings if nav else ()
+
+    @property
+    def next(self) -> NavNode | None:
+        nav = self.nav
+        return nav.next if nav else None
+
+    @property
+    def prev(self) -> NavNode | None:
+        nav = self.nav
+        return nav.prev if nav else None
+
+    @property
+    def collection(self) -> PageCollection:
+        """
+        Collection of pages below this one, for listings.
+
+        Ordered by the ``collection_order`` context value if set (a comma-separated
+        list of fields, eg ``-date,title``), otherwise in navigation order.
+        """
+        ordering = self.context.get("collection_order", self.pages.nav_order)
+        if isinstance(ordering, str):
+            ordering = [field.strip() for field in ordering.split(",")]
+        return self.pages.collection(self.request_path).order_by(*ordering)
 
     def find_src(self) -> Path | None:
         """
@@ -65,31 +211,14 @@ class Page:
         Returns:
             Path to the source file, or None if not found or path is outside root
         """
-        # Build path stem - we'll look under it for a file
-        path_stem = (self.pages.path / self.request_path).resolve()
-
-        # Must be relative to the root
-        if not path_stem.is_relative_to(self.pages.path):
-            return None
-
-        # Look for file
-        search = [
-            Path(f"{path_stem}.html"),
-            Path(f"{path_stem}.md"),
-            path_stem / "index.html",
-            path_stem / "index.md",
-        ]
-        for file_path in search:
-            if file_path.is_file():
-                return file_path
-
-        return None
+        return self.source.find(self.request_path)
 
     def read(self, reload=False) -> tuple[str, dict[str, Any]]:
         """
         Read the page file and parse frontmatter context.
 
-        Data is cached on the Page object for its lifetime.
+        Data is cached on the Page object for its lifetime, and the parsed source is
+        cached on the Pages object until the file changes.
 
         Args:
             reload: If True, forces a reload
@@ -105,17 +234,52 @@ class Page:
 
         if reload or not self._body or not self._context:
             self._body, self._context = self._read()
+            self._html = None
+            self._data = None
 
         return self._body, self._context
 
-    def _read(self) -> tuple[str, dict[str, Any]]:
-        raw = self.src.read_text()
+    def get_token(self) -> tuple[int, int]:
+        """
+        Return a token which changes when the source file changes, to validate caches
+        """
+        return self.source.get_token(self.src)
 
-        # Parse frontmatter
+    def _read(self) -> tuple[str, dict[str, Any]]:
+        cache = self.pages.cache
+        key = ("read", str(self.src))
+        token = self._token = self.get_token()
+
+        parsed = cache.get(key, token) if cache is not None else None
+        if parsed is None:
+            parsed = self.parse(self.source.read_text(self.src))
+            if cache is not None:
+                cache.set(key, parsed, token)
+
+        # Build a fresh context - the view adds to it, so it mustn't be shared
+        body, frontmatter = parsed
         context = {
             "base": "django_nanopages/page.html",
         }
         context.update(self.extra_context)
+        context.update(frontmatter)
+        return body, context
+
+    @staticmethod
+    def parse(raw: str) -> tuple[str, dict[str, Any]]:
+        """
+        Split frontmatter from the raw page source and parse it.
+
+        Args:
+            raw: The raw page source
+
+        Returns:
+            Tuple of (raw body content without frontmatter, frontmatter dict)
+
+        Raises:
+            ValueError: If the frontmatter cannot be parsed
+        """
+        context: dict[str, Any] = {}
 
         if not raw.startswith("---"):
             return raw, context
@@ -132,32 +296,7 @@ class Page:
         raw_context = "\n".join(raw_lines[1:end_index])
         body = "\n".join(raw_lines[end_index + 1 :])
 
-        # Parse frontmatter based on language
-        if lang == "":
-            for line in raw_context.splitlines():
-                if ":" in line:
-                    key, value = line.split(":", 1)
-                    context[key.strip()] = value.strip()
-                else:
-                    context[line] = ""
-
-        elif lang == "json":
-            context.update(json.loads(raw_context))
-
-        elif lang in ["yml", "yaml"]:
-            try:
-                import yaml
-            except ImportError:
-                raise ValueError("Cannot load YAML context, PyYAML is not installed")
-            data = yaml.safe_load(raw_context)
-            if not isinstance(data, dict):
-                raise ValueError("Cannot load YAML context, not a dict")
-            context.update(data)
-
-        else:
-            raise ValueError(f"Unsupported context language {lang}")
-
-        return body, context
+        return body, parse_frontmatter(lang, raw_context)
 
     @property
     def body(self) -> str:
@@ -185,14 +324,68 @@ class Page:
             ValueError: If the page doesn't exist
         """
         body, context = self.read()
+        if self._html is not None:
+            return self._html
 
         if self.src.suffix == ".md":
-            content = markdown.markdown(body)
+            cache = self.pages.cache
+            key = ("html", str(self.src))
+            token = self._token
+
+            # Cached with the data extracted during conversion
+            converted = cache.get(key, token) if cache is not None else None
+            if converted is None:
+                pool = self.pages.markdown_pool
+                if pool is not None:
+                    converted = pool.convert_page(body)
+                else:
+                    converted = convert(body)
+                if cache is not None:
+                    cache.set(key, converted, token)
+            content, data = converted
         else:
             # For HTML files, the body is already HTML
             content = body
+            data = EMPTY_DATA
 
+        self._html = content
+        self._data = data
         return content
 
+    @property
+    def data(self) -> PageData:
+        """
+        Data extracted from markdown content when it is converted to HTML
+
+        HTML pages are not converted, so their data is empty.
+        """
+        data = self._data
+        if data is None:
+            self.as_html()
+            data = self._data
+        return data
+
+    @property
+    def toc(self) -> SafeString:
+        """
+        Table of contents of the ``h2`` to ``h6`` headings, as a nested HTML list
+        """
+        return mark_safe(self.data.toc)
+
+    @property
+    def headings(self) -> tuple[Heading, ...]:
+        return self.data.headings
+
+    @property
+    def word_count(self) -> int:
+        return self.data.word_count
+
+    @property
+    def excerpt(self) -> str:
+        """
+        Text of the first paragraph, truncated to 50 words
+        """
+        return self.data.excerpt
+
     def get_absolute_url(self) -> str:
         return reverse(self.pages.name, args=[self.request_path])
@@ -1,10 +1,36 @@
-from pathlib import Path
+from __future__ import annotations
+
+import gc
+import hashlib
+import time
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Any, Iterable
 
 from django.dispatch import receiver
 from django.urls import URLResolver, include, path, re_path
 from django.utils.autoreload import autoreload_started, file_changed, get_reloader
 
+from .cache import DEFAULT_CACHE_SIZE, PageCache
+from .collection import PageCollection
+from .deps import TemplateDependencies
+from .extract import PageData
+from .feeds import FeedView, SitemapView
+from .index import SUFFIXES, PageIndex
+from .info import PageInfo
+from .nav import NavTree
 from .page import Page
+from .pool import DEFAULT_THRESHOLD, MarkdownPool
+from .reload import ReloadDebouncer
+from .responses import PrebuiltResponses, ResponseCache
+from .search import SearchIndex, SearchResult
+from .snapshot import ReleaseWatcher, Snapshot
+from .sources import (
+    DEFAULT_WATCH_IGNORE,
+    OverlaySource,
+    Source,
+    get_source,
+    is_ignored,
+)
 from .views import PageView
 
 try:
@@ -13,12 +39,16 @@ except ImportError:
     trigger_reload_soon = None
 
 
+if TYPE_CHECKING:
+    from django.core.files.storage import Storage
+
+
 registry = {}
 
 
 class Pages(tuple):
-    #: Path to the source dir
-    path: Path
+    #: Paths of all source dirs and archives, in order of increasing precedence
+    paths: list[Path]
 
     #: Name of this instance
     name: str
@@ -26,43 +56,229 @@ class Pages(tuple):
     #: Template context
     context: dict | None
 
-    def __new__(cls, path: str | Path, name: str | None = None, *, context: dict | None = None):
+    #: Cache of parsed sources and rendered HTML
+    cache: PageCache
+
+    #: Frontmatter key to order pages in the navigation tree
+    nav_order: str
+
+    #: Whether to serve ``sitemap.xml``
+    sitemap: bool
+
+    #: Request path of the section to serve as ``feed.xml``, or None for no feed
+    feed: str | None
+
+    #: Whether to cache rendered page content
+    render_cache: bool
+
+    #: Templates used by each rendered page
+    templates: TemplateDependencies
+
+    #: Cache of complete responses, or None if not enabled
+    response_cache: ResponseCache | None
+
+    #: Process pool for converting large markdown pages, or None if not enabled
+    markdown_pool: MarkdownPool | None
+
+    #: Prebuilt pages to hand off to the web server, or None if not enabled
+    prebuilt: PrebuiltResponses | None
+
+    #: Watches for new releases, or None if not enabled
+    release_watcher: ReleaseWatcher | None = None
+
+    #: Maximum age of the page index in seconds, or None to keep it until invalidated
+    index_refresh_interval: float | None = None
+
+    #: Patterns for names of files and dirs for the autoreloader to ignore
+    watch_ignore: tuple[str, ...] = DEFAULT_WATCH_IGNORE
+
+    #: Whether to build the search index before it is first used
+    preload_search: bool = False
+
+    _snapshot: Snapshot
+    _search_index: SearchIndex | None = None
+
+    def __new__(cls, *args, **kwargs):
         # Create an empty tuple instance
         return super().__new__(cls)
 
     def __init__(
         self,
-        path: str | Path,
+        path: str | Path | Storage | list[str | Path | Storage],
         name: str | None = None,
         *,
         context: dict | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_max_item_size: int | None = None,
+        nav_order: str = "order",
+        sitemap: bool = False,
+        feed: str | None = None,
+        render_cache: bool = False,
+        response_cache: str | None = None,
+        response_cache_timeout: int | None = None,
+        response_cache_vary: Iterable[str] = (),
+        markdown_processes: int = 0,
+        markdown_process_threshold: int = DEFAULT_THRESHOLD,
+        prebuilt: str | Path | None = None,
+        prebuilt_url: str | None = None,
+        watch_release: bool = False,
+        release_check_interval: float = 1.0,
+        watch_ignore: Iterable[str] = DEFAULT_WATCH_IGNORE,
+        index_refresh_interval: float | None = None,
+        preload_search: bool = False,
     ):
         """
         Initialise a set of pages from the specified path
 
         Args:
-            path (str, Path):
-                Path to the directory containing source pages. Relative paths are
-                relative to django.settings.BASE_DIR.
+            path (str, Path, Storage, list):
+                Path to the directory containing source pages, or to a ``.zip`` or
+                ``.tar`` archive of them. Relative paths are relative to
+                django.settings.BASE_DIR. Can also be a Django ``Storage`` instance.
+                Can also be a list of these, to layer them - pages in later layers
+                replace pages with the same request path in earlier layers.
             name (str, None):
                 Name of this group of pages. Used for reverse URL lookups, must be
                 unique.
-                Defaults to the dir name of ``path``.
+                Defaults to the dir name of ``path``, or of the first layer.
             context (dict, None):
                 Common template context for all pages - can be overridden by page
                 context frontmatter.
+            cache_size (int):
+                Memory budget in bytes for caching parsed pages and rendered HTML.
+                Use ``0`` to disable the cache.
+            cache_max_item_size (int, None):
+                Largest single value to cache, in bytes. Defaults to a quarter of
+                ``cache_size``.
+            nav_order (str):
+                Frontmatter key to order pages by in the navigation tree. Pages
+                without it are ordered by request path after those with it.
+            sitemap (bool):
+                If True, serve a ``sitemap.xml`` for all pages.
+            feed (str, None):
+                Request path of a section to serve as an Atom feed at ``feed.xml``,
+                eg ``"blog"``, or ``""`` for all pages. Defaults to no feed.
+            render_cache (bool):
+                If True, cache the rendered content of each page until the page or a
+                template it uses changes. Only use this if pages don't depend on the
+                request, eg they don't use ``{% csrf_token %}`` or ``request.user``.
+            response_cache (str, None):
+                Name of a Django cache to store complete page responses in, eg
+                ``"default"``. Defaults to no response cache.
+            response_cache_timeout (int, None):
+                Timeout for cached responses in seconds. Defaults to ``None``, to keep
+                them until evicted - responses are checked for changes when served.
+            response_cache_vary (list[str]):
+                Names of request headers which change the response, eg
+                ``["Accept-Language"]``. Responses are cached separately for each value,
+                and the headers are added to the ``Vary`` response header.
+            markdown_processes (int):
+                Number of worker processes to convert large markdown pages in, so they
+                don't hold the GIL in the request thread. Defaults to ``0``, to convert
+                all markdown in the request thread.
+            markdown_process_threshold (int):
+                Minimum size of markdown in characters to convert in a worker process.
+                Defaults to 64KB.
+            prebuilt (str, Path, None):
+                Path to a directory of prebuilt pages, as
+                ``<request_path>/index.html``. Pages which have been built since their
+                source last changed are sent by the web server using ``X-Sendfile`` or
+                ``X-Accel-Redirect``. Relative paths are relative to
+                django.settings.BASE_DIR.
+            prebuilt_url (str, None):
+                URL of an internal nginx location serving the ``prebuilt`` directory.
+                If set, prebuilt pages are sent with ``X-Accel-Redirect``, otherwise
+                with ``X-Sendfile``.
+            watch_release (bool):
+                If True, ``path`` is a symlink to the current release. When it changes,
+                the new release is loaded in a background thread and then replaces the
+                old one.
+            release_check_interval (float):
+                Minimum time between checks for a new release, in seconds.
+            watch_ignore (list[str]):
+                Glob patterns for names of files and dirs in the page dirs which the
+                autoreloader should ignore. Defaults to hidden files and dirs, and
+                common build and dependency dirs.
+            index_refresh_interval (float, None):
+                Maximum age of the page index in seconds. Once it is older, the index,
+                navigation tree and collections are rebuilt on next access, so new
+                pages and changed frontmatter are seen without a restart. Defaults to
+                ``None``, to keep them until ``invalidate()`` is called.
+            preload_search (bool):
+                If True, build the search index in ``preload()`` and when a new
+                release is loaded, instead of in the first search.
         """
         from django.conf import settings
+        from django.core.files.storage import Storage
+
+        layers = list(path) if isinstance(path, (list, tuple)) else [path]
+        if not layers:
+            raise ValueError("Pages must have at least one path")
+
+        if watch_release and (len(layers) > 1 or isinstance(layers[0], Storage)):
+            raise ValueError("Only a single path can be watched for releases")
+
+        sources = []
+        self.paths = []
+        release_link = None
+        for layer in layers:
+            if isinstance(layer, Storage):
+                if name is None:
+                    raise ValueError("Pages using a Storage must have a name")
+                sources.append(get_source(layer))
+                continue
 
-        if isinstance(path, str):
-            path = Path(path)
+            if isinstance(layer, str):
+                layer = Path(layer)
 
-        if not path.is_absolute():
-            path = Path(settings.BASE_DIR) / path
+            if not layer.is_absolute():
+                layer = Path(settings.BASE_DIR) / layer
 
-        self.path = path.resolve()
-        self.name = name or self.path.stem
+            if watch_release:
+                # Keep the unresolved link to check for new releases
+                release_link = layer
+
+            layer = layer.resolve()
+            self.paths.append(layer)
+            sources.append(get_source(layer))
+
+        source = sources[0] if len(sources) == 1 else OverlaySource(sources)
+        self._snapshot = Snapshot(source.path, source)
+
+        self.name = name or (release_link or self.path).stem
         self.context = context
+        self.cache = PageCache(cache_size, cache_max_item_size)
+        self.nav_order = nav_order
+        self.sitemap = sitemap
+        self.feed = feed
+        self.render_cache = render_cache
+        self.templates = TemplateDependencies()
+        self.response_cache = (
+            ResponseCache(
+                self, response_cache, response_cache_timeout, response_cache_vary
+            )
+            if response_cache is not None
+            else None
+        )
+        self.markdown_pool = (
+            MarkdownPool(markdown_processes, markdown_process_threshold)
+            if markdown_processes
+            else None
+        )
+        self.prebuilt = None
+        if prebuilt is not None:
+            prebuilt = Path(prebuilt)
+            if not prebuilt.is_absolute():
+                prebuilt = Path(settings.BASE_DIR) / prebuilt
+            self.prebuilt = PrebuiltResponses(self, prebuilt.resolve(), prebuilt_url)
+        self.release_watcher = (
+            ReleaseWatcher(self, release_link, release_check_interval)
+            if release_link is not None
+            else None
+        )
+        self.watch_ignore = tuple(watch_ignore)
+        self.index_refresh_interval = index_refresh_interval
+        self.preload_search = preload_search
         super().__init__()
 
         # Check name uniqueness
@@ -91,62 +307,203 @@ class Pages(tuple):
 
         # Determine which path fns we're going to use
         if distill_path and distill_re_path:
-            return include(
-                [
-                    distill_path(
-                        "",
-                        PageView.as_view(pages=self, extra_context=self.context),
-                        name=self.name,
-                    ),
-                    distill_re_path(
-                        r"^(.*)/$",
-                        PageView.as_view(pages=self, extra_context=self.context),
-                        name=self.name,
-                        distill_func=self.get_request_paths,
-                    ),
-                ],
-            )
-
-        return include(
-            [
-                path(
-                    "",
-                    PageView.as_view(pages=self, extra_context=self.context),
-                    name=self.name,
+            path_fn = distill_path
+            re_path_fn = distill_re_path
+            distill = lambda **kwargs: kwargs  # noqa: E731
+        else:
+            path_fn = path
+            re_path_fn = re_path
+            distill = lambda **kwargs: {}  # noqa: E731
+
+        view = PageView.as_view(pages=self, extra_context=self.context)
+        patterns = [
+            path_fn("", view, name=self.name),
+            re_path_fn(
+                r"^(.*)/$",
+                view,
+                name=self.name,
+                **distill(distill_func=self.get_request_paths),
+            ),
+        ]
+
+        if self.sitemap:
+            patterns += [
+                path_fn(
+                    "sitemap.xml",
+                    SitemapView.as_view(pages=self),
+                    name=f"{self.name}-sitemap",
+                    **distill(distill_file="sitemap.xml"),
                 ),
-                re_path(
-                    r"^(.*)/$",
-                    PageView.as_view(pages=self, extra_context=self.context),
-                    name=self.name,
+                path_fn(
+                    "sitemap-<int:section>.xml",
+                    SitemapView.as_view(pages=self),
+                    name=f"{self.name}-sitemap",
+                    **distill(distill_func=self.get_sitemap_sections),
                 ),
             ]
-        )
 
-    def get_request_paths(self) -> list[str]:
+        if self.feed is not None:
+            patterns.append(
+                path_fn(
+                    "feed.xml",
+                    FeedView.as_view(pages=self, section=self.feed),
+                    name=f"{self.name}-feed",
+                    **distill(distill_file="feed.xml"),
+                )
+            )
+
+        return include(patterns)
+
+    def get_sitemap_sections(self) -> list[dict[str, int]]:
         """
-        Get all request paths for the pages
+        Get the URL kwargs for each split sitemap, for django-distill
         """
-        paths: list[str] = []
+        num_sections = -(-len(self.index) // SitemapView.limit)
+        if num_sections < 2:
+            return []
+        return [{"section": section} for section in range(1, num_sections + 1)]
 
-        if not self.path.is_dir():
-            return paths
+    @property
+    def snapshot(self) -> Snapshot:
+        """
+        The current snapshot of the page sources and the data derived from them.
 
-        for file_path in self.path.rglob("*"):
-            if file_path.suffix not in [".md", ".html"]:
-                continue
+        If the snapshot is older than ``index_refresh_interval``, it is invalidated so
+        it will be rebuilt. If watching for releases, this starts loading a new release
+        in the background if there is one.
+        """
+        snapshot = self._snapshot
+        interval = self.index_refresh_interval
+        if interval is not None and time.monotonic() - snapshot.created > interval:
+            self.invalidate()
+            snapshot = self._snapshot
+        if self.release_watcher is not None:
+            self.release_watcher.check(snapshot.path)
+        return snapshot
 
-            if file_path.name in ["index.md", "index.html"]:
-                request_path = f"{file_path.parent.relative_to(self.path)}"
-            else:
-                abs_path = file_path.with_name(file_path.name[: -len(file_path.suffix)])
-                request_path = f"{abs_path.relative_to(self.path)}"
+    @property
+    def path(self) -> Path:
+        """
+        Path to the source dir or archive, or ``Path("")`` for a Storage. If there are
+        several layers, this is the path of the first.
+        """
+        return self.snapshot.path
 
-            if request_path == ".":
-                continue
+    @property
+    def source(self) -> Source:
+        """
+        Source of page files
+        """
+        return self.snapshot.source
+
+    @property
+    def version(self) -> int:
+        """
+        Incremented when invalidated or a new release is loaded, to validate caches
+        """
+        return self.snapshot.version
+
+    @property
+    def index(self) -> PageIndex:
+        """
+        Index of request paths to source files, built on first access
+        """
+        return self.snapshot.index
+
+    @property
+    def nav(self) -> NavTree:
+        """
+        Navigation tree of all pages, built on first access
+        """
+        return self.get_nav(self.snapshot)
+
+    def get_nav(self, snapshot: Snapshot) -> NavTree:
+        nav = snapshot.nav
+        if nav is None:
+            infos = self.get_page_infos(fields=[self.nav_order], snapshot=snapshot)
+            nav = snapshot.nav = NavTree(self, infos, self.nav_order)
+        return nav
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Hash of the request paths, sources and source tokens of every page, to
+        validate cached responses which may include other pages, such as navigation.
+
+        Calculated once until invalidated.
+        """
+        snapshot = self.snapshot
+        fingerprint = snapshot.fingerprint
+        if fingerprint is None:
+            digest = hashlib.md5()
+            for request_path, src in snapshot.index.items():
+                token = snapshot.source.get_token(src)
+                digest.update(repr((request_path, str(src), token)).encode())
+            fingerprint = snapshot.fingerprint = digest.hexdigest()
+        return fingerprint
+
+    def invalidate(self):
+        """
+        Discard the page index, navigation tree, collections and source listing so they
+        are rebuilt on next access
+
+        Called automatically when the autoreloader sees a change to a page.
+        """
+        snapshot = self._snapshot
+        source = snapshot.source.invalidate()
+        self._snapshot = Snapshot(snapshot.path, source, snapshot.version + 1)
+        if self._search_index is not None:
+            self._search_index.mark_stale()
+
+    def load_release(self, path: Path):
+        """
+        Load a release of the pages from a new path, and replace the current release.
+
+        The new release's page index and navigation tree are built and its pages are
+        loaded into the cache first, so requests don't wait for them. If the search
+        index has been built or ``preload_search`` is set, a new search index is built
+        too. Requests which have already started finish with the old release.
+
+        Called in a background thread when watching for releases.
+        """
+        source = get_source(path)
+        snapshot = Snapshot(path, source, self._snapshot.version + 1)
+        self.get_nav(snapshot)
+        self.warm(snapshot)
+
+        search_index = self._search_index
+        if search_index is not None or self.preload_search:
+            # Build a new index so searches don't wait for it
+            search_index = SearchIndex(self)
+            search_index.refresh(snapshot)
+
+        self._snapshot = snapshot
+        self.paths = [path]
+        self._search_index = search_index
+
+    def invalidate_template(self, template: str | Path) -> set[str]:
+        """
+        Discard the cached content of pages which rendered the template
+
+        Called automatically when the autoreloader sees a change to a template.
 
-            paths.append(request_path)
+        Args:
+            template: Path to the template file
 
-        return paths
+        Returns:
+            Request paths of the pages which were discarded
+        """
+        request_paths = self.templates.get_dependents(template)
+        for request_path in request_paths:
+            self.cache.delete(("render", request_path))
+            self.templates.discard(request_path)
+        return request_paths
+
+    def get_request_paths(self) -> list[str]:
+        """
+        Get all request paths for the pages
+        """
+        return [request_path for request_path in self.index if request_path]
 
     def get_page(self, request_path: str) -> Page | None:
         """
@@ -158,11 +515,210 @@ class Pages(tuple):
         Returns:
             Page instance for the request path, or None if the page doesn't exist
         """
-        page = Page(request_path=request_path, pages=self, extra_context=self.context)
+        snapshot = self.snapshot
+        source = snapshot.source
+        src = snapshot.index.get(request_path)
+        if src is not None and source.is_file(src):
+            return Page(
+                request_path=request_path,
+                pages=self,
+                extra_context=self.context,
+                src=src,
+                source=source,
+            )
+
+        if src is not None:
+            # Removed since the index was built
+            self.invalidate()
+
+        # The index may be stale, so check the filesystem
+        page = Page(
+            request_path=request_path,
+            pages=self,
+            extra_context=self.context,
+            source=source,
+        )
         if not page.exists:
             return None
+
+        if src is None:
+            # Added since the index was built
+            self.invalidate()
         return page
 
+    def get_page_infos(
+        self, fields: Iterable[str] = (), snapshot: Snapshot | None = None
+    ) -> list[PageInfo]:
+        """
+        Get a compact PageInfo record for every page, without creating Page objects.
+
+        Only the frontmatter of each source file is read, unless the fields include
+        ``PageData`` fields such as ``word_count`` - then each page's data is taken
+        from the page cache, or its body is converted.
+
+        Args:
+            fields: Names of frontmatter fields to include in each record
+            snapshot: The snapshot to read - defaults to the current snapshot
+
+        Returns:
+            List of PageInfo records, ordered by request path
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        fields = tuple(fields)
+        source = snapshot.source
+        with_data = any(field in PageData._fields for field in fields)
+
+        infos = []
+        for request_path, src in snapshot.index.items():
+            data = None
+            if with_data:
+                data = Page(
+                    request_path=request_path, pages=self, src=src, source=source
+                ).data
+            infos.append(PageInfo.from_src(source, request_path, src, fields, data))
+        return infos
+
+    def collection(self, section: str = "") -> PageCollection:
+        """
+        Get a lazy collection of all pages below a section, for listings.
+
+        Args:
+            section: Request path of the section, eg ``"blog"``. Defaults to all pages.
+        """
+        return PageCollection(self, section)
+
+    def get_field_values(self, fields: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Get the values of frontmatter fields for every page.
+
+        Values are cached until invalidated, so each field is only read once.
+
+        Returns:
+            Dict of ``{field: {request_path: value}}``
+        """
+        return self._get_field_values(self.snapshot, fields)
+
+    def _get_field_values(
+        self, snapshot: Snapshot, fields: Iterable[str]
+    ) -> dict[str, dict[str, Any]]:
+        fields = set(fields)
+        field_values = snapshot.field_values
+        missing = fields.difference(field_values)
+        if missing:
+            infos = self.get_page_infos(fields=missing, snapshot=snapshot)
+            for field in missing:
+                if field in PageInfo.__slots__:
+                    values = {info.request_path: getattr(info, field) for info in infos}
+                else:
+                    values = {info.request_path: info.get(field) for info in infos}
+                field_values[field] = values
+
+        return {field: field_values[field] for field in fields}
+
+    def get_collection_paths(self, collection: PageCollection) -> tuple[str, ...]:
+        """
+        Get the request paths matching a collection, cached until invalidated
+        """
+        snapshot = self.snapshot
+        key = collection.get_cache_key()
+        if key is not None:
+            request_paths = self.cache.get(("collection", key), snapshot.version)
+            if request_paths is not None:
+                return request_paths
+
+        request_paths = collection.resolve(
+            self._get_field_values(snapshot, collection.get_fields()), snapshot.index
+        )
+        if key is not None:
+            self.cache.set(("collection", key), request_paths, snapshot.version)
+        return request_paths
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """
+        Full-text search index of all pages, built on first search unless
+        ``preload_search`` is set
+        """
+        search_index = self._search_index
+        if search_index is None:
+            search_index = self._search_index = SearchIndex(self)
+        return search_index
+
+    def search(self, query: str, limit: int = 10) -> list[SearchResult]:
+        """
+        Search the text of all pages.
+
+        The search index is built on the first search, or by ``preload()`` if
+        ``preload_search`` is set. It is updated with any changed pages on the next
+        search after the pages are invalidated.
+
+        Args:
+            query: Search terms
+            limit: Maximum number of results
+
+        Returns:
+            List of results, best match first
+        """
+        return self.search_index.search(query, limit=limit)
+
+    def preload(self, freeze: bool = True) -> dict[str, int]:
+        """
+        Load and render every page into the cache.
+
+        Call this before forking worker processes (eg with gunicorn ``--preload``) so
+        that workers share one copy of the cache. The cached pages are frozen into a
+        read-only dict, so looking them up in workers doesn't write to the shared
+        memory. If ``preload_search`` is set, the search index is built too. If the
+        markdown process pool is enabled, it is started in each forked worker.
+
+        Args:
+            freeze: If True, move all objects into the permanent GC generation
+                afterwards, so the garbage collector won't touch the shared memory
+                pages in workers
+
+        Returns:
+            Cache statistics, as ``cache.stats()`` - if there were evictions, the
+            ``cache_size`` is too small to hold all pages
+        """
+        self.invalidate()
+        snapshot = self.snapshot
+        self.warm(snapshot)
+        if self.preload_search:
+            self.search_index.refresh(snapshot)
+        if self.markdown_pool is not None:
+            # Workers are forked from this process, they start their own pools
+            self.markdown_pool.prefork()
+        self.cache.freeze()
+
+        if freeze:
+            gc.collect()
+            gc.freeze()
+
+        return self.cache.stats()
+
+    def warm(self, snapshot: Snapshot):
+        """
+        Load and render every page in a snapshot into the cache
+        """
+        # Only fetch pages which aren't cached - the cached ones won't be read, so their
+        # content would be held until invalidated
+        source = snapshot.source
+        source.prefetch(
+            src
+            for src in snapshot.index.values()
+            if ("read", str(src)) not in self.cache
+        )
+        for request_path, src in snapshot.index.items():
+            page = Page(
+                request_path=request_path,
+                pages=self,
+                extra_context=self.context,
+                src=src,
+                source=source,
+            )
+            page.as_html()
+
     def __getitem__(self, index):
         return self.urls[index]
 
@@ -182,10 +738,39 @@ class Pages(tuple):
         # Try to register with autoreloader if it's already running
         reloader = get_reloader()
         if reloader is not None:
-            reloader.watch_dir(self.path, "**/*")
+            self.watch(reloader)
+
+    def watch(self, reloader):
+        """
+        Register the page sources with an autoreloader
+
+        Only page source files and the dirs which hold them are watched - templates
+        are watched by Django. Call this again when a dir changes, to watch new dirs.
+        """
+        self.source.watch(reloader, self.is_watched)
+
+    def is_watched(self, file_path: Path) -> bool:
+        """
+        Return True if a changed file is a page source, page dir or archive of these
+        pages
+        """
+        for root in self.source.get_watch_paths():
+            if file_path == root:
+                return True
+            if file_path.is_relative_to(root):
+                relative = PurePath(file_path.relative_to(root))
+                if is_ignored(relative, self.watch_ignore) or (
+                    self.prebuilt is not None
+                    and file_path.is_relative_to(self.prebuilt.path)
+                ):
+                    return False
+                return file_path.suffix in SUFFIXES or file_path.is_dir()
+        return False
 
 
 if trigger_reload_soon is not None:
+    #: Invalidates changed pages and reloads the browser once per burst of changes
+    reload_debouncer = ReloadDebouncer(trigger_reload_soon)
 
     @receiver(autoreload_started, dispatch_uid="nanopages_autoreload_started")
     def watch_pages_directories(sender, **kwargs):
@@ -193,7 +778,7 @@ if trigger_reload_soon is not None:
         Register all Pages directories with Django's autoreloader
         """
         for pages in registry.values():
-            sender.watch_dir(pages.path, "**/*")
+            pages.watch(sender)
 
     @receiver(file_changed, dispatch_uid="nanopages_file_changed")
     def nanopages_file_changed(sender, file_path, **kwargs):
@@ -201,12 +786,32 @@ if trigger_reload_soon is not None:
         Handle file changes in registered directories
         """
         for pages in registry.values():
-            if file_path.is_relative_to(pages.path):
-                # File is in one of our directories, tell django-browser-reload
-                trigger_reload_soon()
+            if pages.is_watched(file_path):
+                if file_path.is_dir():
+                    # Files added or removed, watch any new dirs
+                    pages.watch(sender)
+
+                # Page source changed, tell django-browser-reload once changes settle
+                reload_debouncer.add(pages)
 
                 # Prevent server restart
                 return True
 
+            roots = pages.source.get_watch_paths()
+            if any(file_path.is_relative_to(root) for root in roots):
+                # Ignored file in one of our directories
+                return True
+
         # Not our file
         return None
+
+
+@receiver(file_changed, dispatch_uid="nanopages_template_changed")
+def nanopages_template_changed(sender, file_path, **kwargs):
+    """
+    Discard cached pages which depend on a changed template
+
+    Returns None so Django's own template change handling still runs.
+    """
+    for pages in registry.values():
+        pages.invalidate_template(file_path)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import markdown
+
+from . import extract
+from .extract import PageData
+
+
+#: Default minimum size of markdown to convert in the pool, in characters
+DEFAULT_THRESHOLD = 64 * 1024
+
+#: Markdown converter in a worker process, created by ``init_worker``
+_converter: markdown.Markdown | None = None
+
+
+def init_worker():
+    """
+    Create the markdown converter once when a worker process starts, so each
+    conversion doesn't need to load the extensions again
+    """
+    global _converter
+    _converter = extract.create_converter()
+
+
+def convert_page(body: str) -> tuple[str, PageData]:
+    """
+    Convert markdown to HTML and extract its page data in a worker process
+    """
+    if _converter is None:
+        init_worker()
+    return extract.convert(body, _converter)
+
+
+def _after_fork(ref: weakref.ref[MarkdownPool]):
+    pool = ref()
+    if pool is not None:
+        pool.after_fork()
+
+
+class MarkdownPool:
+    """
+    Persistent process pool to convert large markdown pages outside the request thread
+
+    Converting a large page holds the GIL, which stalls other requests in threaded
+    workers. Markdown over the ``threshold`` is converted in a separate process, and
+    the calling thread waits without holding the GIL. Smaller markdown is converted
+    in the calling thread, where it is faster than sending it to another process.
+
+    The pool is started by ``start()``, or on first use, in each process, so it is
+    safe to create before forking workers. If it was started before a fork, or
+    ``prefork()`` was called, it is started again in the background in each forked
+    process, so the first large page doesn't wait for the workers to spawn.
+    """
+
+    #: Number of worker processes
+    processes: int
+
+    #: Minimum size of markdown to convert in the pool, in characters
+    threshold: int
+
+    #: Thread starting the pool after a fork, if any
+    thread: threading.Thread | None
+
+    def __init__(self, processes: int, threshold: int = DEFAULT_THRESHOLD):
+        self.processes = processes
+        self.threshold = threshold
+        self._executor: ProcessPoolExecutor | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+        self._start_after_fork = False
+        self.thread = None
+        if hasattr(os, "register_at_fork"):
+            # Held weakly, so the pool can still be garbage collected
+            callback = functools.partial(_after_fork, weakref.ref(self))
+            os.register_at_fork(after_in_child=callback)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {self.processes} processes>"
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # Use spawn so workers don't inherit the state of a threaded server
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker,
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def start(self):
+        """
+        Start all the worker processes and wait until they are ready
+        """
+        executor = self.executor
+        self._start_after_fork = True
+        # Each task spawns another worker until there are enough to run them all
+        futures = [executor.submit(os.getpid) for _ in range(self.processes)]
+        for future in futures:
+            future.result()
+
+    def after_fork(self):
+        """
+        Reset the pool in a forked process, and start it in the background if it had
+        been started or prepared before the fork
+        """
+        # The lock may have been held by another thread when the process forked
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self.thread = None
+        if self._start_after_fork:
+            self.thread = threading.Thread(
+                target=self.start, name="nanopages-markdown-pool", daemon=True
+            )
+            self.thread.start()
+
+    def convert_page(self, body: str) -> tuple[str, PageData]:
+        """
+        Convert markdown to HTML and extract its page data, in the pool if it is over
+        the threshold
+        """
+        if len(body) < self.threshold:
+            return extract.convert(body)
+        return self.executor.submit(convert_page, body).result()
+
+    def shutdown(self):
+        """
+        Stop the worker processes - they will be started again if needed
+        """
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
+            self._pid = None
+            self._start_after_fork = False
+
+    def prefork(self):
+        """
+        Stop any worker processes in this process, and start the pool in each process
+        forked from it
+
+        Call this in a server's master process, which won't convert pages itself.
+        """
+        self.shutdown()
+        self._start_after_fork = True
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Callable
+
+
+if TYPE_CHECKING:
+    from .pages import Pages
+
+
+#: Seconds to wait after a change for more changes, before reloading
+DEFAULT_RELOAD_DELAY = 0.1
+
+
+class ReloadDebouncer:
+    """
+    Invalidate changed pages and reload the browser once for a burst of changes
+
+    The autoreloader reports each changed file separately, so a bulk edit such as a
+    branch checkout would otherwise invalidate the pages and reload the browser for
+    every file. Instead, changes are collected until none have been seen for
+    ``delay`` seconds.
+    """
+
+    #: Called once after each burst of changes
+    callback: Callable[[], None] | None
+
+    #: Seconds to wait for more changes
+    delay: float
+
+    #: Timer waiting to flush the changes, if any are pending
+    timer: threading.Timer | None
+
+    def __init__(
+        self,
+        callback: Callable[[], None] | None = None,
+        delay: float = DEFAULT_RELOAD_DELAY,
+    ):
+        self.callback = callback
+        self.delay = delay
+        self.timer = None
+        self._pending: dict[str, Pages] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<ReloadDebouncer: {len(self._pending)} pending>"
+
+    def add(self, pages: Pages):
+        """
+        Record a change to the pages, and restart the wait for more changes
+        """
+        with self._lock:
+            self._pending[pages.name] = pages
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        """
+        Invalidate all changed pages, then call the callback once
+        """
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending = {}
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+
+        if not pending:
+            return
+
+        for pages in pending:
+            pages.invalidate()
+
+        if self.callback is not None:
+            self.callback()
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import cc_delim_re, patch_vary_headers
+from django.utils.encoding import iri_to_uri
+
+from .deps import get_template_version
+
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+
+    from .pages import Pages
+
+
+class ResponseCache:
+    """
+    Cache of complete page responses in a Django cache.
+
+    Each response is keyed on the request scheme and host, the page's source file
+    modification time and size, the page index, the ``Pages`` context and the ``vary``
+    request headers, and stored with
+    the modification times of the templates it used. A cached response is only served
+    if those templates are unchanged, so entries never go stale and can be kept for as
+    long as the cache allows.
+
+    Responses are not cached for requests with a query string, responses which aren't
+    ``200 OK``, pages which used the session, user, CSRF token or set a cookie, or
+    responses marked as private or varying on other request headers.
+    """
+
+    #: The Pages instance
+    pages: Pages
+
+    #: Name of the Django cache to use
+    alias: str
+
+    #: Cache timeout in seconds, or None to keep until evicted
+    timeout: int | None
+
+    #: Request headers which change the response
+    vary: tuple[str, ...]
+
+    def __init__(
+        self,
+        pages: Pages,
+        alias: str = "default",
+        timeout: int | None = None,
+        vary: Iterable[str] = (),
+    ):
+        self.pages = pages
+        self.alias = alias
+        self.timeout = timeout
+        self.vary = tuple(vary)
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    def get_context_hash(self) -> str:
+        context = json.dumps(self.pages.context or {}, sort_keys=True, default=str)
+        return hashlib.md5(context.encode()).hexdigest()
+
+    def get_key(self, request, request_path: str) -> str | None:
+        """
+        Return the cache key for the request, or None if it can't be cached
+
+        Does not construct the Page - the source file is found in the page index.
+        """
+        if request.method not in ("GET", "HEAD") or request.META.get("QUERY_STRING"):
+            return None
+
+        src = self.pages.index.get(request_path)
+        if src is None:
+            return None
+
+        try:
+            token = self.pages.source.get_token(src)
+        except (OSError, ValueError):
+            # Removed since the index was built
+            return None
+
+        parts = (
+            request.scheme,
+            request.get_host(),
+            request_path,
+            str(src),
+            token,
+            self.pages.fingerprint,
+            self.get_context_hash(),
+            tuple(request.headers.get(header, "") for header in self.vary),
+        )
+        digest = hashlib.md5(repr(parts).encode()).hexdigest()
+        return f"nanopages:{self.pages.name}:{digest}"
+
+    def get(self, key: str) -> HttpResponse | None:
+        """
+        Return the cached response, or None if missing or a template has changed
+        """
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+
+        content, headers, templates, version = cached
+        if get_template_version(templates) != version:
+            return None
+
+        response = HttpResponse(content)
+        for header, value in headers:
+            response[header] = value
+        return response
+
+    def set(self, request, key: str, response: HttpResponse, templates: Iterable[str]):
+        """
+        Cache the response if it doesn't depend on the request beyond its URL
+        """
+        session = getattr(request, "session", None)
+        if (
+            response.status_code != 200
+            or response.streaming
+            or response.cookies
+            or request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+            or (session is not None and session.accessed)
+            or self.is_private(response)
+        ):
+            return
+
+        templates = tuple(sorted(templates))
+        cached = (
+            response.content,
+            tuple(response.items()),
+            templates,
+            get_template_version(templates),
+        )
+        self.cache.set(key, cached, self.timeout)
+
+    def is_private(self, response: HttpResponse) -> bool:
+        """
+        Return True if the response's own headers say it mustn't be shared - it is
+        ``private`` or ``no-store``, or varies on headers not in ``vary``
+        """
+        directives = {
+            directive.split("=", 1)[0].strip().lower()
+            for directive in cc_delim_re.split(response.get("Cache-Control", ""))
+        }
+        if directives & {"private", "no-store", "no-cache"}:
+            return True
+
+        allowed = {header.lower() for header in self.vary}
+        varies = {
+            header.strip().lower()
+            for header in cc_delim_re.split(response.get("Vary", ""))
+            if header.strip()
+        }
+        return not varies <= allowed
+
+    def patch(self, response: HttpResponse) -> HttpResponse:
+        """
+        Add the ``Vary`` headers to a response
+        """
+        if self.vary:
+            patch_vary_headers(response, self.vary)
+        return response
+
+
+class PrebuiltResponses:
+    """
+    Hand off prebuilt pages to the web server to send.
+
+    If a page has been rendered to ``<path>/<request_path>/index.html`` since its source
+    file last changed, the response is empty, with an ``X-Accel-Redirect`` header for
+    nginx if ``url`` is set, otherwise an ``X-Sendfile`` header for Apache and others.
+    """
+
+    #: The Pages instance
+    pages: Pages
+
+    #: Path to the prebuilt output directory
+    path: Path
+
+    #: URL of the internal nginx location serving ``path``, or None for X-Sendfile
+    url: str | None
+
+    def __init__(self, pages: Pages, path: Path, url: str | None = None):
+        self.pages = pages
+        self.path = path
+        self.url = url
+
+    def get_file(self, request_path: str) -> Path:
+        """
+        Return the path of the prebuilt file for the request path
+        """
+        return self.path / request_path / "index.html"
+
+    def get(self, request, request_path: str) -> HttpResponse | None:
+        """
+        Return a response to send the prebuilt page, or None if it isn't prebuilt or is
+        older than the page source
+
+        Does not construct the Page - the source file is found in the page index.
+        """
+        if request.method not in ("GET", "HEAD") or request.META.get("QUERY_STRING"):
+            return None
+
+        src = self.pages.index.get(request_path)
+        if src is None:
+            return None
+
+        prebuilt = self.get_file(request_path)
+        try:
+            mtime, _ = self.pages.source.get_token(src)
+            if prebuilt.stat().st_mtime_ns < mtime:
+                return None
+        except (OSError, ValueError):
+            return None
+
+        response = HttpResponse(content_type="text/html; charset=utf-8")
+        if self.url is not None:
+            location = prebuilt.relative_to(self.path).as_posix()
+            url = f"{self.url.rstrip('/')}/{location}"
+            response["X-Accel-Redirect"] = iri_to_uri(url)
+        else:
+            response["X-Sendfile"] = str(prebuilt)
+        return response
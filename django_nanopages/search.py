@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+from typing import TYPE_CHECKING
+
+from django.urls import reverse
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import SafeString, mark_safe
+
+from .page import Page
+
+
+if TYPE_CHECKING:
+    from .pages import Pages
+    from .snapshot import Snapshot
+
+
+#: Pattern to split text into search terms
+TERM_PATTERN = re.compile(r"\w+")
+
+#: Pattern to remove Django template syntax from HTML pages
+TEMPLATE_PATTERN = re.compile(r"{%.*?%}|{{.*?}}|{#.*?#}", re.DOTALL)
+
+#: Number of characters of context either side of a match in a snippet
+SNIPPET_CONTEXT = 80
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def get_terms(text: str) -> list[str]:
+    return TERM_PATTERN.findall(text.lower())
+
+
+def get_text(page: Page) -> str:
+    """
+    Get the plain text of a page, without markup or template syntax
+    """
+    html = TEMPLATE_PATTERN.sub(" ", page.as_html())
+    return " ".join(strip_tags(html).split())
+
+
+class SearchResult:
+    """
+    A page matching a search query
+    """
+
+    __slots__ = ("pages", "request_path", "title", "score", "snippet")
+
+    #: The page's request path
+    request_path: str
+
+    #: The page title
+    title: str
+
+    #: Relevance score - higher is better
+    score: float
+
+    #: Extract of the page text around the first match, with matches in ``<mark>``
+    snippet: SafeString
+
+    def __init__(
+        self,
+        pages: Pages,
+        request_path: str,
+        title: str,
+        score: float,
+        snippet: SafeString,
+    ):
+        self.pages = pages
+        self.request_path = request_path
+        self.title = title
+        self.score = score
+        self.snippet = snippet
+
+    def __repr__(self) -> str:
+        return f"<SearchResult: {self.request_path} ({self.score:.2f})>"
+
+    @property
+    def page(self) -> Page | None:
+        return self.pages.get_page(self.request_path)
+
+    def get_absolute_url(self) -> str:
+        return reverse(self.pages.name, args=[self.request_path])
+
+
+class SearchIndex:
+    """
+    In-memory inverted index of page text, ranked with BM25
+
+    Built from the page index on first use, or by ``Pages.preload()``. After
+    ``mark_stale()``, the next search re-indexes only pages which have been added,
+    changed or removed.
+    """
+
+    #: Term to ``{doc id: term frequency}``
+    postings: dict[str, dict[int, int]]
+
+    def __init__(self, pages: Pages):
+        self.pages = pages
+        self.postings = {}
+        self.stale = True
+        self._doc_ids: dict[str, int] = {}
+        self._docs: dict[int, tuple[str, str, tuple[int, int], tuple[str, ...]]] = {}
+        self._lengths: dict[int, int] = {}
+        self._total_length = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def mark_stale(self):
+        """
+        Check for changed pages before the next search
+        """
+        self.stale = True
+
+    def refresh(self, snapshot: Snapshot | None = None):
+        """
+        Add, update and remove pages which have changed since the last refresh
+
+        Args:
+            snapshot: The snapshot to index - defaults to the current snapshot
+        """
+        with self._lock:
+            if not self.stale:
+                return
+
+            if snapshot is None:
+                snapshot = self.pages.snapshot
+            index = snapshot.index
+            source = snapshot.source
+            for request_path in list(self._doc_ids):
+                if request_path not in index:
+                    self.remove(request_path)
+
+            for request_path, src in index.items():
+                token = source.get_token(src)
+                doc_id = self._doc_ids.get(request_path)
+                if doc_id is not None and self._docs[doc_id][2] == token:
+                    continue
+
+                self.remove(request_path)
+                page = Page(
+                    request_path=request_path, pages=self.pages, src=src, source=source
+                )
+                try:
+                    self.add(page, token)
+                except ValueError:
+                    # Invalid frontmatter - leave it out of the index
+                    continue
+
+            self.stale = False
+
+    def add(self, page: Page, token: tuple[int, int]):
+        terms = get_terms(f"{page.title} {get_text(page)}")
+        frequencies: dict[str, int] = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+        doc_id = self._next_id
+        self._next_id += 1
+        self._doc_ids[page.request_path] = doc_id
+        self._docs[doc_id] = (page.request_path, page.title, token, tuple(frequencies))
+        self._lengths[doc_id] = len(terms)
+        self._total_length += len(terms)
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+
+    def remove(self, request_path: str):
+        doc_id = self._doc_ids.pop(request_path, None)
+        if doc_id is None:
+            return
+
+        _, _, _, terms = self._docs.pop(doc_id)
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+
+    def search(self, query: str, limit: int = 10) -> list[SearchResult]:
+        """
+        Find the pages which best match the query
+
+        Args:
+            query: Search terms
+            limit: Maximum number of results
+
+        Returns:
+            List of results, best match first
+        """
+        if self.stale:
+            self.refresh()
+
+        terms = set(get_terms(query))
+        with self._lock:
+            num_docs = len(self._docs)
+            if not terms or not num_docs:
+                return []
+
+            average_length = self._total_length / num_docs
+            weighted = []
+            for term in terms:
+                postings = self.postings.get(term)
+                if postings:
+                    df = len(postings)
+                    idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+                    weighted.append((idf, postings))
+
+            # Score the rarest terms first. A term can add at most ``idf * (K1 + 1)``
+            # to a page, so once the remaining terms can't lift an unseen page into
+            # the results, they only need to be added to pages already found
+            weighted.sort(key=lambda item: item[0], reverse=True)
+            remaining = sum(idf for idf, _ in weighted) * (K1 + 1)
+            scores: dict[int, float] = {}
+            for idf, postings in weighted:
+                if len(scores) >= limit and remaining < min(
+                    heapq.nlargest(limit, scores.values())
+                ):
+                    items = [(i, postings[i]) for i in scores if i in postings]
+                else:
+                    items = postings.items()
+
+                remaining -= idf * (K1 + 1)
+                for doc_id, frequency in items:
+                    norm = K1 * (1 - B + B * self._lengths[doc_id] / average_length)
+                    score = idf * frequency * (K1 + 1) / (frequency + norm)
+                    scores[doc_id] = scores.get(doc_id, 0) + score
+
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            matches = [(self._docs[doc_id], score) for doc_id, score in ranked]
+
+        # Build snippets outside the lock, they need to read the pages
+        results = []
+        for (request_path, title, _, _), score in matches:
+            page = self.pages.get_page(request_path)
+            snippet = get_snippet(get_text(page), terms) if page else SafeString("")
+            results.append(
+                SearchResult(self.pages, request_path, title, score, snippet)
+            )
+        return results
+
+
+def get_snippet(text: str, terms: set[str]) -> SafeString:
+    """
+    Extract the text around the first matching term, with matches in ``<mark>``
+    """
+    pattern = re.compile(
+        r"\b(" + "|".join(re.escape(term) for term in terms) + r")\b", re.IGNORECASE
+    )
+    match = pattern.search(text)
+    if match is None:
+        start, end = 0, SNIPPET_CONTEXT * 2
+    else:
+        start = max(0, match.start() - SNIPPET_CONTEXT)
+        end = match.end() + SNIPPET_CONTEXT
+
+    extract = text[start:end]
+    parts = []
+    last = 0
+    for found in pattern.finditer(extract):
+        parts.append(escape(extract[last : found.start()]))
+        parts.append(f"<mark>{escape(found.group())}</mark>")
+        last = found.end()
+    parts.append(escape(extract[last:]))
+
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(text) else ""
+    return mark_safe(prefix + "".join(parts) + suffix)
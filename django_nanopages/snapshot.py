@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .index import PageIndex
+
+
+if TYPE_CHECKING:
+    from .nav import NavTree
+    from .pages import Pages
+    from .sources import Source
+
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """
+    The page sources at one point in time, with the data derived from them
+
+    The path, source and version never change. The index, navigation tree and field
+    values are built from the source once, on first access. A ``Pages`` instance
+    replaces its snapshot with a new one when invalidated or when a new release is
+    loaded, so a request which started with a snapshot can finish with it.
+    """
+
+    __slots__ = (
+        "path",
+        "source",
+        "version",
+        "_index",
+        "nav",
+        "field_values",
+        "fingerprint",
+        "created",
+    )
+
+    #: Path to the source dir or archive
+    path: Path
+
+    #: Source of page files
+    source: Source
+
+    #: Incremented for each new snapshot, to validate cached collections
+    version: int
+
+    #: Navigation tree, once built
+    nav: NavTree | None
+
+    #: Cached frontmatter values, as ``{field: {request_path: value}}``
+    field_values: dict[str, dict[str, Any]]
+
+    #: Hash of the index and source tokens, once calculated
+    fingerprint: str | None
+
+    #: Monotonic time the snapshot was created
+    created: float
+
+    def __init__(self, path: Path, source: Source, version: int = 0):
+        self.path = path
+        self.source = source
+        self.version = version
+        self._index: PageIndex | None = None
+        self.nav = None
+        self.field_values = {}
+        self.fingerprint = None
+        self.created = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"<Snapshot: {self.path} v{self.version}>"
+
+    @property
+    def index(self) -> PageIndex:
+        index = self._index
+        if index is None:
+            index = self._index = PageIndex.build(self.source)
+        return index
+
+
+class ReleaseWatcher:
+    """
+    Watch a symlink to the current release of the pages, and load new releases in a
+    background thread
+
+    The link is checked at most once every ``interval`` seconds, when the pages are
+    accessed. When it points somewhere new, a snapshot of the new release is built and
+    warmed in a background thread, then swapped in; until then the old release is
+    served.
+    """
+
+    #: The Pages instance
+    pages: Pages
+
+    #: Path to the symlink
+    link: Path
+
+    #: Minimum time between checks of the link, in seconds
+    interval: float
+
+    #: Thread building the last new release, if any
+    thread: threading.Thread | None
+
+    def __init__(self, pages: Pages, link: Path, interval: float = 1.0):
+        self.pages = pages
+        self.link = link
+        self.interval = interval
+        self.thread = None
+        self._checked = time.monotonic()
+        self._failed: Path | None = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<ReleaseWatcher: {self.link}>"
+
+    def get_release(self) -> Path:
+        """
+        Return the path of the current release
+        """
+        return Path(os.path.realpath(self.link))
+
+    def check(self, current: Path):
+        """
+        Start loading the current release in the background if it isn't ``current``
+
+        Returns immediately - the new release is used once it has loaded.
+        """
+        now = time.monotonic()
+        if now - self._checked < self.interval:
+            return
+        self._checked = now
+
+        release = self.get_release()
+        if release == current or release == self._failed:
+            return
+
+        if not self._lock.acquire(blocking=False):
+            # Already loading a release
+            return
+
+        self.thread = threading.Thread(
+            target=self.load,
+            args=(release,),
+            name=f"nanopages-release-{self.pages.name}",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def load(self, release: Path):
+        try:
+            # May have been loaded since it was checked
+            if release != self.pages._snapshot.path:
+                self.pages.load_release(release)
+        except Exception:
+            logger.exception("Could not load pages release %s", release)
+            self._failed = release
+        finally:
+            self._lock.release()
@@ -0,0 +1,562 @@
+from __future__ import annotations
+
+import io
+import mmap
+import os
+import posixpath
+import struct
+import tarfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePath
+from typing import IO, TYPE_CHECKING, Callable, Iterable, Iterator
+
+from .index import INDEX_NAMES, SUFFIXES
+
+
+if TYPE_CHECKING:
+    from django.core.files.storage import Storage
+
+
+#: Names of files and dirs in page dirs which the autoreloader doesn't watch
+DEFAULT_WATCH_IGNORE = (".*", "__pycache__", "node_modules", "_build", "_site")
+
+
+def is_ignored(path: PurePath, ignore: Iterable[str]) -> bool:
+    """
+    Return True if any part of a relative path matches one of the ignore patterns
+    """
+    return any(fnmatchcase(part, pattern) for part in path.parts for pattern in ignore)
+
+
+def watch_tree(reloader, path: Path, is_watched: Callable[[Path], bool]):
+    """
+    Register the page source files in a directory tree with an autoreloader
+
+    Each dir which is watched is registered with a glob for each page suffix, so the
+    reloader never walks ignored dirs. The dirs themselves are watched too, so when
+    files are added or removed the tree can be registered again to find new dirs.
+
+    Args:
+        reloader: The autoreloader
+        path: Root of the tree
+        is_watched: Returns False for dirs which should not be watched
+    """
+    for dir_path, dir_names, _ in os.walk(path):
+        dir_path = Path(dir_path)
+        dir_names[:] = [name for name in dir_names if is_watched(dir_path / name)]
+        reloader.extra_files.add(dir_path)
+        for suffix in SUFFIXES:
+            reloader.watch_dir(dir_path, f"*{suffix}")
+
+
+class Source:
+    """
+    Base class for a collection of page source files
+
+    Source files are identified by ``Path`` objects under ``source.path``; subclasses
+    define how they are listed and read.
+    """
+
+    #: Root path of the source
+    path: Path
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {self.path}>"
+
+    def find(self, request_path: str) -> Path | None:
+        """
+        Find the source file for the request path.
+
+        Returns:
+            Path to the source file, or None if not found or path is outside root
+        """
+        raise NotImplementedError()
+
+    def scan(self) -> Iterator[tuple[str, Path]]:
+        """
+        List all files which could be pages
+
+        Yields:
+            Tuples of (POSIX path relative to the root, source file path)
+        """
+        raise NotImplementedError()
+
+    def is_file(self, src: Path) -> bool:
+        raise NotImplementedError()
+
+    def get_token(self, src: Path) -> tuple[int, int]:
+        """
+        Return the ``(mtime in ns, size)`` of the source file, to validate caches
+        """
+        raise NotImplementedError()
+
+    def read_text(self, src: Path) -> str:
+        raise NotImplementedError()
+
+    def open(self, src: Path) -> IO[str]:
+        """
+        Open the source file for reading as text
+        """
+        return io.StringIO(self.read_text(src))
+
+    def prefetch(self, srcs: Iterable[Path]):
+        """
+        Prepare to read the given source files soon
+        """
+        pass
+
+    def invalidate(self) -> Source:
+        """
+        Discard anything cached about the source files
+
+        Returns:
+            The source to use from now on - this source, or a new one if the source
+            files have been replaced
+        """
+        return self
+
+    def get_watch_paths(self) -> list[Path]:
+        """
+        Return the local dirs and files which hold the source files, to watch for
+        changes
+        """
+        return []
+
+    def watch(self, reloader, is_watched: Callable[[Path], bool]):
+        """
+        Register the source files with an autoreloader
+
+        Args:
+            reloader: The autoreloader
+            is_watched: Returns False for dirs which should not be watched
+        """
+        for path in self.get_watch_paths():
+            if path.is_dir():
+                watch_tree(reloader, path, is_watched)
+            else:
+                reloader.watch_dir(path.parent, path.name)
+
+
+class DirectorySource(Source):
+    """
+    Page source files in a directory on the local filesystem
+    """
+
+    def find(self, request_path: str) -> Path | None:
+        # Build path stem - we'll look under it for a file
+        path_stem = (self.path / request_path).resolve()
+
+        # Must be relative to the root
+        if not path_stem.is_relative_to(self.path):
+            return None
+
+        # Look for file
+        search = [Path(f"{path_stem}{suffix}") for suffix in SUFFIXES] + [
+            path_stem / name for name in INDEX_NAMES
+        ]
+        for file_path in search:
+            if file_path.is_file():
+                return file_path
+
+        return None
+
+    def scan(self) -> Iterator[tuple[str, Path]]:
+        if not self.path.is_dir():
+            return
+
+        for file_path in self.path.rglob("*"):
+            if file_path.suffix not in SUFFIXES or not file_path.is_file():
+                continue
+            yield file_path.relative_to(self.path).as_posix(), file_path
+
+    def is_file(self, src: Path) -> bool:
+        return src.is_file()
+
+    def get_token(self, src: Path) -> tuple[int, int]:
+        stat = src.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read_text(self, src: Path) -> str:
+        return src.read_text()
+
+    def open(self, src: Path) -> IO[str]:
+        return src.open()
+
+    def get_watch_paths(self) -> list[Path]:
+        return [self.path]
+
+
+class MemberSource(Source):
+    """
+    Base class for page source files listed once and held in memory.
+
+    Source file paths are the source path joined with the member name.
+    """
+
+    _members: dict[str, tuple[int, int] | None] | None = None
+
+    @property
+    def members(self) -> dict[str, tuple[int, int] | None]:
+        """
+        Member names mapped to ``(mtime in ns, size)``, or None if not yet known
+        """
+        members = self._members
+        if members is None:
+            members = self._members = self.load_members()
+        return members
+
+    def load_members(self) -> dict[str, tuple[int, int] | None]:
+        raise NotImplementedError()
+
+    def load_token(self, name: str) -> tuple[int, int]:
+        raise NotImplementedError()
+
+    def read_member(self, name: str) -> bytes:
+        raise NotImplementedError()
+
+    def get_member(self, src: Path) -> str:
+        return src.relative_to(self.path).as_posix()
+
+    def find(self, request_path: str) -> Path | None:
+        # Must be relative to the root
+        normalised = posixpath.normpath(request_path)
+        if normalised == ".." or normalised.startswith("../"):
+            return None
+
+        path_stem = posixpath.normpath(f"/{request_path}")[1:]
+
+        if path_stem:
+            search = [f"{path_stem}{suffix}" for suffix in SUFFIXES] + [
+                f"{path_stem}/{name}" for name in INDEX_NAMES
+            ]
+        else:
+            search = list(INDEX_NAMES)
+
+        members = self.members
+        for name in search:
+            if name in members:
+                return self.path / name
+
+        return None
+
+    def scan(self) -> Iterator[tuple[str, Path]]:
+        for name in self.members:
+            if posixpath.splitext(name)[1] in SUFFIXES:
+                yield name, self.path / name
+
+    def is_file(self, src: Path) -> bool:
+        return self.get_member(src) in self.members
+
+    def get_token(self, src: Path) -> tuple[int, int]:
+        name = self.get_member(src)
+        token = self.members[name]
+        if token is None:
+            token = self.members[name] = self.load_token(name)
+        return token
+
+    def read_text(self, src: Path) -> str:
+        return self.read_member(self.get_member(src)).decode("utf-8")
+
+
+class ArchiveSource(MemberSource):
+    """
+    Base class for page source files in a single archive file.
+
+    The archive is memory-mapped, and its members are indexed once when it is opened,
+    so finding and reading pages makes no filesystem calls. Source file paths are
+    the archive path joined with the member name, eg ``content.zip/blog/post.md``.
+
+    When invalidated, a new source is returned if the file has changed. The mapping
+    is never changed or closed while in use - it is released once requests using the
+    old source have finished with it.
+    """
+
+    mmap: mmap.mmap
+
+    #: ``(inode, mtime in ns, size)`` of the mapped archive file
+    _stat: tuple[int, int, int]
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        with self.path.open("rb") as file:
+            stat = os.fstat(file.fileno())
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self._members = self.load_members()
+
+    def invalidate(self) -> Source:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            # Being replaced, keep the current archive until it is back
+            return self
+        if (stat.st_ino, stat.st_mtime_ns, stat.st_size) == self._stat:
+            return self
+        return type(self)(self.path)
+
+    def get_watch_paths(self) -> list[Path]:
+        return [self.path]
+
+
+class ZipSource(ArchiveSource):
+    """
+    Page source files in a zip archive
+
+    Stored and deflated members are read directly from the memory-mapped archive.
+    """
+
+    #: Member names mapped to their ZipInfo from the central directory
+    infos: dict[str, zipfile.ZipInfo]
+
+    def load_members(self) -> dict[str, tuple[int, int]]:
+        with zipfile.ZipFile(self.mmap) as archive:
+            self.infos = {
+                info.filename: info for info in archive.infolist() if not info.is_dir()
+            }
+
+        return {
+            name: (
+                int(time.mktime(info.date_time + (0, 0, -1)) * 1_000_000_000),
+                info.file_size,
+            )
+            for name, info in self.infos.items()
+        }
+
+    def read_member(self, name: str) -> bytes:
+        info = self.infos[name]
+
+        # Skip the local file header, which has variable length name and extra fields
+        offset = info.header_offset
+        name_length, extra_length = struct.unpack(
+            "<HH", self.mmap[offset + 26 : offset + 30]
+        )
+        start = offset + 30 + name_length + extra_length
+        data = self.mmap[start : start + info.compress_size]
+
+        if info.compress_type == zipfile.ZIP_STORED:
+            return data
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+        raise ValueError(f"Unsupported compression for {name} in {self.path}")
+
+
+class TarSource(ArchiveSource):
+    """
+    Page source files in an uncompressed tar archive
+
+    Members are read directly from the memory-mapped archive.
+    """
+
+    #: Member names mapped to their ``(start, end)`` offsets in the archive
+    offsets: dict[str, tuple[int, int]]
+
+    def load_members(self) -> dict[str, tuple[int, int]]:
+        members = {}
+        self.offsets = {}
+        with tarfile.open(fileobj=self.mmap, mode="r:") as archive:
+            for info in archive:
+                if not info.isfile():
+                    continue
+                name = posixpath.normpath(info.name)
+                members[name] = (int(info.mtime) * 1_000_000_000, info.size)
+                self.offsets[name] = (
+                    info.offset_data,
+                    info.offset_data + info.size,
+                )
+        return members
+
+    def read_member(self, name: str) -> bytes:
+        start, end = self.offsets[name]
+        return self.mmap[start:end]
+
+
+class StorageSource(MemberSource):
+    """
+    Page source files in a Django Storage
+
+    Files are listed once and cached until invalidated. Source file paths are relative
+    to the root of the storage.
+    """
+
+    #: Number of threads to use when prefetching files
+    prefetch_workers: int = 8
+
+    _prefetched: dict[str, bytes]
+
+    def __init__(self, storage: Storage, prefetch_workers: int | None = None):
+        super().__init__(Path(""))
+        self.storage = storage
+        if prefetch_workers is not None:
+            self.prefetch_workers = prefetch_workers
+        self._prefetched = {}
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {type(self.storage).__name__}>"
+
+    def load_members(self) -> dict[str, tuple[int, int] | None]:
+        members: dict[str, tuple[int, int] | None] = {}
+        dirs = [""]
+        while dirs:
+            parent = dirs.pop()
+            subdirs, files = self.storage.listdir(parent)
+            dirs.extend(posixpath.join(parent, subdir) for subdir in subdirs)
+            members.update((posixpath.join(parent, name), None) for name in files)
+        return members
+
+    def load_token(self, name: str) -> tuple[int, int]:
+        try:
+            mtime = self.storage.get_modified_time(name).timestamp()
+        except NotImplementedError:
+            mtime = 0
+        return (int(mtime * 1_000_000_000), self.storage.size(name))
+
+    def read_member(self, name: str) -> bytes:
+        prefetched = self._prefetched.pop(name, None)
+        if prefetched is not None:
+            return prefetched
+
+        with self.storage.open(name, "rb") as file:
+            return file.read()
+
+    def fetch(self, name: str) -> tuple[tuple[int, int], bytes]:
+        token = self.load_token(name)
+        with self.storage.open(name, "rb") as file:
+            return token, file.read()
+
+    def prefetch(self, srcs: Iterable[Path]):
+        """
+        Read the given source files concurrently, ready for the next reads
+        """
+        names = [self.get_member(src) for src in srcs]
+        with ThreadPoolExecutor(max_workers=self.prefetch_workers) as executor:
+            for name, (token, content) in zip(names, executor.map(self.fetch, names)):
+                self.members[name] = token
+                self._prefetched[name] = content
+
+    def invalidate(self) -> Source:
+        self._members = None
+        self._prefetched = {}
+        return self
+
+    def get_watch_paths(self) -> list[Path]:
+        # Only local storage can be watched
+        try:
+            return [Path(self.storage.path(""))]
+        except NotImplementedError:
+            return []
+
+
+class OverlaySource(Source):
+    """
+    Page source files from several sources layered over each other
+
+    Sources are listed in order of increasing precedence - where more than one source
+    has a page for a request path, the page from the last one is used.
+    """
+
+    #: Layered sources, lowest precedence first
+    sources: tuple[Source, ...]
+
+    _owners: dict[Path, Source]
+
+    def __init__(self, sources: Iterable[Source]):
+        self.sources = tuple(sources)
+        super().__init__(self.sources[0].path)
+        self._owners = {}
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {', '.join(map(repr, self.sources))}>"
+
+    def set_owner(self, src: Path, source: Source):
+        """
+        Record the layer which a source file belongs to
+        """
+        self._owners[src] = source
+
+    def get_owner(self, src: Path) -> Source:
+        """
+        Return the layer which a source file belongs to
+
+        Layers such as storages can share a root path, so if more than one layer could
+        hold the file, the last one which has it is used, as for ``find``.
+        """
+        owner = self._owners.get(src)
+        if owner is None:
+            candidates = [
+                source
+                for source in reversed(self.sources)
+                if src.is_relative_to(source.path)
+            ]
+            if not candidates:
+                raise ValueError(f"{src} is not in {self}")
+            owner = next(
+                (source for source in candidates if source.is_file(src)),
+                candidates[0],
+            )
+            self._owners[src] = owner
+        return owner
+
+    def find(self, request_path: str) -> Path | None:
+        for source in reversed(self.sources):
+            src = source.find(request_path)
+            if src is not None:
+                self._owners[src] = source
+                return src
+        return None
+
+    def scan(self) -> Iterator[tuple[str, Path]]:
+        for source in self.sources:
+            for rel_path, src in source.scan():
+                self._owners[src] = source
+                yield rel_path, src
+
+    def is_file(self, src: Path) -> bool:
+        return self.get_owner(src).is_file(src)
+
+    def get_token(self, src: Path) -> tuple[int, int]:
+        return self.get_owner(src).get_token(src)
+
+    def read_text(self, src: Path) -> str:
+        return self.get_owner(src).read_text(src)
+
+    def open(self, src: Path) -> IO[str]:
+        return self.get_owner(src).open(src)
+
+    def prefetch(self, srcs: Iterable[Path]):
+        layers: dict[Source, list[Path]] = {}
+        for src in srcs:
+            layers.setdefault(self.get_owner(src), []).append(src)
+        for source, source_srcs in layers.items():
+            source.prefetch(source_srcs)
+
+    def invalidate(self) -> Source:
+        sources = tuple(source.invalidate() for source in self.sources)
+        if sources != self.sources:
+            return type(self)(sources)
+        self._owners = {}
+        return self
+
+    def get_watch_paths(self) -> list[Path]:
+        return [path for source in self.sources for path in source.get_watch_paths()]
+
+
+def get_source(path: Path | Storage) -> Source:
+    """
+    Return the Source for a resolved ``Pages`` path or a Django Storage
+    """
+    from django.core.files.storage import Storage
+
+    if isinstance(path, Storage):
+        return StorageSource(path)
+    if path.suffix == ".zip" and path.is_file():
+        return ZipSource(path)
+    if path.suffix == ".tar" and path.is_file():
+        return TarSource(path)
+    return DirectorySource(path)
@@ -7,6 +7,7 @@ from django.shortcuts import render
 from django.template import RequestContext, Template
 from django.views import View
 
+from .deps import track_templates
 from .page import Page
 
 if TYPE_CHECKING:
@@ -33,16 +34,73 @@ class PageView(View):
         if not self.pages:
             raise ValueError("Cannot render a Page without an associated Pages object")
 
+        prebuilt = self.pages.prebuilt
+        if prebuilt is not None:
+            response = prebuilt.get(request, request_path)
+            if response is not None:
+                return response
+
+        response_cache = self.pages.response_cache
+        key = response_cache.get_key(request, request_path) if response_cache else None
+        if key is not None:
+            response = response_cache.get(key)
+            if response is not None:
+                return response
+
         # Get the page using Pages.get_page
         page = self.pages.get_page(request_path)
         if page is None:
             raise Http404()
 
+        if self.pages.render_cache:
+            response = self.render_cached(page)
+        elif key is not None:
+            response = self.render_tracked(page)
+        else:
+            response = self.render_page(page)
+
+        if response_cache is not None:
+            response_cache.patch(response)
+            if key is not None:
+                templates = self.pages.templates.templates.get(request_path, ())
+                response_cache.set(request, key, response, templates)
+        return response
+
+    def render_page(self, page: Page) -> HttpResponse:
         if page.src.suffix == ".md":
             return self.render_md(page)
         else:
             return self.render_html(page)
 
+    def render_tracked(self, page: Page) -> HttpResponse:
+        """
+        Render the page and record the templates it used
+        """
+        with track_templates() as templates:
+            response = self.render_page(page)
+        self.pages.templates.record(page.request_path, templates)
+        return response
+
+    def render_cached(self, page: Page) -> HttpResponse:
+        """
+        Render the page, or return its cached content if neither the page, the page
+        index nor any template it used have changed since it was cached
+        """
+        pages = self.pages
+        key = ("render", page.request_path)
+        version = pages.templates.get_version(page.request_path)
+        if version is not None:
+            token = (page.get_token(), pages.version, version)
+            content = pages.cache.get(key, token)
+            if content is not None:
+                return HttpResponse(content)
+
+        response = self.render_tracked(page)
+        version = pages.templates.get_version(page.request_path)
+        token = (page.get_token(), pages.version, version)
+        pages.cache.set(key, response.content, token)
+        return response
+
     def render_md(self, page: Page) -> HttpResponse:
         context = page.context
         context["page"] = page
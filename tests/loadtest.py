@@ -0,0 +1,352 @@
+"""
+Load test a Pages mount with concurrent in-process clients
+
+Serves a generated tree of pages, or the example site's pages, through Django's WSGI
+and ASGI handlers in this process, and reports throughput and latency percentiles for
+cold and warm caches. No server or external load generator is needed.
+
+Usage::
+
+    python -m tests.loadtest --clients 16 --requests 5000
+    python -m tests.loadtest --example --server asgi --response-cache
+
+Run ``python -m tests.loadtest --help`` for all options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+
+#: Path to the example site's pages
+EXAMPLE_PAGES = Path(__file__).parent.parent / "example" / "pages"
+
+
+@dataclass
+class Report:
+    """
+    Results of a load test run
+    """
+
+    #: Name of the run
+    name: str
+
+    #: Wall clock time for all requests, in seconds
+    duration: float = 0
+
+    #: Latency of each request, in seconds
+    latencies: list[float] = field(default_factory=list)
+
+    #: Number of responses for each status code
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    def add(self, status: int, latency: float):
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.duration if self.duration else 0
+
+    def percentile(self, percent: int) -> float:
+        """
+        Return the latency percentile, in seconds
+        """
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0
+        return statistics.quantiles(self.latencies, n=100)[percent - 1]
+
+    def __str__(self) -> str:
+        statuses = ", ".join(
+            f"{status}: {count}" for status, count in sorted(self.statuses.items())
+        )
+        return (
+            f"{self.name:<12} {len(self.latencies):>7} requests"
+            f" {self.throughput:>9.1f} req/s"
+            f"  p50 {self.percentile(50) * 1000:>7.2f}ms"
+            f"  p95 {self.percentile(95) * 1000:>7.2f}ms"
+            f"  p99 {self.percentile(99) * 1000:>7.2f}ms"
+            f"  ({statuses})"
+        )
+
+
+def get_urls(
+    request_paths: list[str], num_requests: int, miss_ratio: float, seed: int = 0
+) -> list[str]:
+    """
+    Build a random mix of URLs for existing pages and missing pages
+    """
+    rand = random.Random(seed)
+    urls = []
+    for i in range(num_requests):
+        if not request_paths or rand.random() < miss_ratio:
+            urls.append(f"/missing-{i}/")
+        else:
+            request_path = rand.choice(request_paths)
+            urls.append(f"/{request_path}/" if request_path else "/")
+    return urls
+
+
+def run_wsgi(
+    application: Callable, urls: list[str], clients: int, name="wsgi"
+) -> Report:
+    """
+    Request the URLs from a WSGI application with concurrent client threads
+    """
+    report = Report(name)
+    lock = threading.Lock()
+
+    def request(url: str):
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": url,
+            "QUERY_STRING": "",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": "localhost",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(b""),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        status = []
+
+        def start_response(status_line, headers, exc_info=None):
+            status.append(int(status_line.split(" ", 1)[0]))
+
+        start = time.perf_counter()
+        response = application(environ, start_response)
+        try:
+            for _ in response:
+                pass
+        finally:
+            if hasattr(response, "close"):
+                response.close()
+        latency = time.perf_counter() - start
+
+        with lock:
+            report.add(status[0], latency)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(request, urls))
+    report.duration = time.perf_counter() - start
+    return report
+
+
+def run_asgi(
+    application: Callable, urls: list[str], clients: int, name="asgi"
+) -> Report:
+    """
+    Request the URLs from an ASGI application with concurrent client tasks
+    """
+    report = Report(name)
+
+    async def request(url: str):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": url,
+            "raw_path": url.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"localhost")],
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        requested = False
+        status = []
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Never disconnect - the handler cancels this when it has responded
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        start = time.perf_counter()
+        await application(scope, receive, send)
+        report.add(status[0], time.perf_counter() - start)
+
+    async def client(queue: list[str]):
+        while queue:
+            await request(queue.pop())
+
+    async def run():
+        queue = list(reversed(urls))
+        await asyncio.gather(*(client(queue) for _ in range(clients)))
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    report.duration = time.perf_counter() - start
+    return report
+
+
+def generate_pages(path: Path, num_pages: int):
+    """
+    Write a tree of markdown pages in sections of 50
+    """
+    (path / "index.md").write_text("---\ntitle: Home\n---\n# Home")
+    for i in range(num_pages):
+        section = path / f"section-{i // 50}"
+        section.mkdir(exist_ok=True)
+        (section / f"page-{i}.md").write_text(
+            f"---\ntitle: Page {i}\ndate: 2026-01-01\n---\n# Page {i}\n\n"
+            + "Lorem ipsum dolor sit amet. " * 100
+        )
+
+
+def setup(pages_path: Path, **pages_kwargs):
+    """
+    Configure Django to serve a Pages mount at the root, and return it
+    """
+    import django
+    from django.conf import settings
+    from django.urls import path
+
+    urlconf = ModuleType("loadtest_urls")
+    urlconf.urlpatterns = []
+    sys.modules[urlconf.__name__] = urlconf
+
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY="loadtest",
+        ALLOWED_HOSTS=["*"],
+        BASE_DIR=pages_path.parent,
+        INSTALLED_APPS=["django_nanopages", "django_style"],
+        ROOT_URLCONF=urlconf.__name__,
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "APP_DIRS": True,
+                "OPTIONS": {
+                    "context_processors": [
+                        "django.template.context_processors.request",
+                    ],
+                },
+            }
+        ],
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        },
+        LOGGING={
+            "version": 1,
+            "disable_existing_loggers": False,
+            "loggers": {"django.request": {"level": "ERROR"}},
+        },
+    )
+    django.setup()
+
+    from django_nanopages.pages import Pages
+
+    pages = Pages(
+        pages_path, name="pages", context={"site_title": "Load test"}, **pages_kwargs
+    )
+    urlconf.urlpatterns.append(path("", pages))
+    return pages
+
+
+def reset(pages):
+    """
+    Empty all caches, for a cold run
+    """
+    from django.core.cache import caches
+
+    pages.invalidate()
+    pages.cache.clear()
+    pages.templates.clear()
+    caches["default"].clear()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--example", action="store_true", help="Serve the example site's pages"
+    )
+    parser.add_argument("--pages", type=Path, help="Serve pages from this directory")
+    parser.add_argument(
+        "--num-pages", type=int, default=500, help="Number of pages to generate"
+    )
+    parser.add_argument(
+        "--clients", type=int, default=16, help="Number of concurrent clients"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Number of requests per run"
+    )
+    parser.add_argument(
+        "--miss-ratio", type=float, default=0.1, help="Proportion of 404 requests"
+    )
+    parser.add_argument(
+        "--server", choices=["wsgi", "asgi", "both"], default="both", help="Handler"
+    )
+    parser.add_argument(
+        "--render-cache", action="store_true", help="Enable the render cache"
+    )
+    parser.add_argument(
+        "--response-cache", action="store_true", help="Enable the response cache"
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.example:
+            pages_path = EXAMPLE_PAGES
+        elif args.pages:
+            pages_path = args.pages.resolve()
+        else:
+            pages_path = Path(tmp_dir) / "pages"
+            pages_path.mkdir()
+            generate_pages(pages_path, args.num_pages)
+
+        pages = setup(
+            pages_path,
+            render_cache=args.render_cache,
+            response_cache="default" if args.response_cache else None,
+        )
+
+        from django.core.asgi import get_asgi_application
+        from django.core.wsgi import get_wsgi_application
+
+        urls = get_urls(list(pages.index), args.requests, args.miss_ratio)
+        servers = ["wsgi", "asgi"] if args.server == "both" else [args.server]
+        print(
+            f"{len(pages.index)} pages, {args.clients} clients,"
+            f" {args.miss_ratio:.0%} missing"
+        )
+        for server in servers:
+            if server == "wsgi":
+                application, run = get_wsgi_application(), run_wsgi
+            else:
+                application, run = get_asgi_application(), run_asgi
+
+            reset(pages)
+            print(run(application, urls, args.clients, name=f"{server} cold"))
+            print(run(application, urls, args.clients, name=f"{server} warm"))
+
+
+if __name__ == "__main__":
+    main()
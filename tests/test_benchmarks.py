@@ -0,0 +1,181 @@
+"""
+Benchmarks for performance-sensitive code paths
+
+Timing checks are marked ``benchmark`` and skipped by default - run them with
+``pytest -m benchmark -s`` to see the results.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from types import ModuleType
+
+import pytest
+from django.urls import path
+
+from django_nanopages.page import Page, _parse_frontmatter
+from django_nanopages.pages import Pages
+
+from .loadtest import get_urls, run_asgi, run_wsgi
+
+
+NUM_PAGES = 1000
+
+#: Number of pages to search in the search benchmark
+NUM_SEARCH_PAGES = 100_000
+
+
+@pytest.fixture
+def pages_dir(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    pages_path = tmp_path / "pages"
+    pages_path.mkdir()
+    for i in range(NUM_PAGES):
+        (pages_path / f"post-{i}.md").write_text(
+            f"---\ntitle: Post {i}\ndate: 2026-01-01\n---\n" + "Lorem ipsum. " * 200
+        )
+    return pages_path
+
+
+def measure(fn) -> tuple[object, int]:
+    """
+    Return the result of ``fn()`` and the memory still allocated by it, in bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def test_memory_per_page(pages_dir):
+    pages = Pages(pages_dir, cache_size=0)
+    request_paths = list(pages.index)
+
+    def load_pages():
+        loaded = [pages.get_page(request_path) for request_path in request_paths]
+        for page in loaded:
+            page.read()
+        return loaded
+
+    def load_infos():
+        return pages.get_page_infos(fields=["date"])
+
+    loaded_pages, page_size = measure(load_pages)
+    infos, info_size = measure(load_infos)
+    assert len(loaded_pages) == len(infos) == NUM_PAGES
+
+    print(
+        f"\nMemory per page: Page {page_size // NUM_PAGES} bytes,"
+        f" PageInfo {info_size // NUM_PAGES} bytes"
+    )
+    assert info_size * 5 < page_size
+
+
+def test_search(pages_dir):
+    pages = Pages(pages_dir)
+    pages.search_index.refresh()
+    results = pages.search("lorem post 1")
+    assert len(results) == 10
+
+
+@pytest.fixture
+def search_pages_dir(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    pages_path = tmp_path / "pages"
+    pages_path.mkdir()
+    for i in range(NUM_SEARCH_PAGES):
+        (pages_path / f"post-{i}.md").write_text(
+            f"---\ntitle: Post {i}\n---\nLorem ipsum {i % 997} dolor {i % 101}."
+        )
+    return pages_path
+
+
+@pytest.mark.benchmark
+def test_search_speed(search_pages_dir):
+    pages = Pages(search_pages_dir)
+
+    start = time.perf_counter()
+    pages.search_index.refresh()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(100):
+        results = pages.search(f"lorem {i} dolor")
+    query_time = (time.perf_counter() - start) / 100
+
+    assert len(results) == 10
+    print(
+        f"\nSearch {NUM_SEARCH_PAGES} pages: build {build_time:.1f}s,"
+        f" query {query_time * 1000:.2f}ms"
+    )
+    assert query_time < 0.05
+
+
+FRONTMATTER = {
+    "plain": "---\ntitle: Post\ndate: 2026-01-01\ntags: news\n---\n",
+    "json": '---json\n{"title": "Post", "date": "2026-01-01", "tags": ["news"]}\n---\n',
+    "yaml": "---yaml\ntitle: Post\ndate: 2026-01-01\ntags:\n  - news\n---\n",
+}
+
+
+@pytest.mark.parametrize("lang", list(FRONTMATTER))
+def test_frontmatter_cache(lang):
+    raw = FRONTMATTER[lang] + "Lorem ipsum."
+    _parse_frontmatter.cache_clear()
+    first = Page.parse(raw)
+    second = Page.parse(raw)
+    assert first == second
+    assert _parse_frontmatter.cache_info().hits == 1
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("lang", list(FRONTMATTER))
+def test_frontmatter_speed(lang):
+    raw = FRONTMATTER[lang] + "Lorem ipsum."
+
+    def parse_all(cached):
+        start = time.perf_counter()
+        for _ in range(NUM_PAGES):
+            if not cached:
+                _parse_frontmatter.cache_clear()
+            Page.parse(raw)
+        return (time.perf_counter() - start) / NUM_PAGES
+
+    uncached_time = parse_all(cached=False)
+    cached_time = parse_all(cached=True)
+
+    print(
+        f"\nParse {lang} frontmatter: uncached {uncached_time * 1e6:.1f}us,"
+        f" cached {cached_time * 1e6:.1f}us"
+    )
+    if lang != "plain":
+        assert cached_time < uncached_time
+
+
+def test_load(pages_dir, settings, monkeypatch):
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+
+    pages = Pages(pages_dir)
+    urlconf = ModuleType("loadtest_urls")
+    urlconf.urlpatterns = [path("", pages)]
+    monkeypatch.setitem(sys.modules, urlconf.__name__, urlconf)
+    settings.ROOT_URLCONF = urlconf.__name__
+    settings.ALLOWED_HOSTS = ["*"]
+    settings.MIDDLEWARE = []
+
+    urls = get_urls(list(pages.index), 200, miss_ratio=0.1)
+    for report in [
+        run_wsgi(get_wsgi_application(), urls, clients=8),
+        run_asgi(get_asgi_application(), urls, clients=8),
+    ]:
+        print(f"\n{report}")
+        assert len(report.latencies) == 200
+        assert set(report.statuses) == {200, 404}
+        assert report.percentile(50) <= report.percentile(99)
@@ -0,0 +1,115 @@
+from django_nanopages.cache import PageCache, sizeof
+
+
+def test_get_set():
+    cache = PageCache(1000)
+    assert cache.set("a", "value", token=1, size=10)
+    assert cache.get("a", 1) == "value"
+    assert cache.size == 10
+
+
+def test_get_stale_token():
+    cache = PageCache(1000)
+    cache.set("a", "value", token=1, size=10)
+    assert cache.get("a", 2) is None
+    assert "a" not in cache
+    assert cache.size == 0
+
+
+def test_evicts_least_recently_used_by_size():
+    cache = PageCache(100, max_item_size=100)
+    cache.set("a", "a", size=40)
+    cache.set("b", "b", size=40)
+    cache.get("a")
+    cache.set("c", "c", size=40)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.size == 80
+    assert cache.stats()["evictions"] == 1
+
+
+def test_rejects_oversized_items():
+    cache = PageCache(100, max_item_size=50)
+    cache.set("a", "a", size=40)
+    assert cache.set("b", "b", size=60) is False
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.stats()["rejections"] == 1
+
+
+def test_replace_updates_size():
+    cache = PageCache(100)
+    cache.set("a", "a", size=20)
+    cache.set("a", "b", size=10)
+    assert cache.size == 10
+    assert len(cache) == 1
+
+
+def test_disabled():
+    cache = PageCache(0)
+    assert cache.set("a", "a") is False
+    assert cache.get("a") is None
+
+
+def test_stats():
+    cache = PageCache(1000, max_item_size=500)
+    cache.set("a", "a", size=10)
+    cache.get("a")
+    cache.get("b")
+    assert cache.stats() == {
+        "size": 10,
+        "max_size": 1000,
+        "max_item_size": 500,
+        "entries": 1,
+        "frozen": 0,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "rejections": 0,
+    }
+
+
+def test_freeze():
+    cache = PageCache(100, max_item_size=100)
+    cache.set("a", "a", token=1, size=40)
+    cache.freeze()
+    assert cache.stats()["frozen"] == 1
+    assert cache._entries == {}
+
+    # Frozen lookups are not counted or reordered
+    assert cache.get("a", 1) == "a"
+    assert cache.stats()["hits"] == 0
+
+    # Frozen entries count towards the budget, but aren't evicted
+    cache.set("b", "b", size=40)
+    cache.set("c", "c", size=40)
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.size == 80
+
+    # A stale frozen entry is a miss, and can be replaced
+    assert cache.get("a", 2) is None
+    cache.set("a", "new", token=2, size=10)
+    assert cache.get("a", 2) == "new"
+
+
+def test_freeze_delete_and_clear():
+    cache = PageCache(100, max_item_size=100)
+    cache.set("a", "a", size=10)
+    cache.set("b", "b", size=10)
+    cache.freeze()
+    cache.delete("a")
+    assert "a" not in cache
+    assert cache.size == 10
+    assert cache.frozen_size == 10
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == cache.frozen_size == 0
+
+
+def test_sizeof_follows_containers():
+    body = "x" * 1000
+    assert sizeof((body, {"key": "value"})) > sizeof(body) + sizeof("value")
@@ -0,0 +1,123 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.paginator import Paginator
+
+from django_nanopages.pages import Pages
+
+
+@pytest.fixture
+def pages(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    root = tmp_path / "pages"
+    blog = root / "blog"
+    blog.mkdir(parents=True)
+    (root / "about.md").write_text("# About")
+    (blog / "index.md").write_text("---\ncollection_order: -date\n---\n# Blog")
+    for i in range(1, 26):
+        tag = "even" if i % 2 == 0 else "odd"
+        (blog / f"post-{i:02}.md").write_text(
+            f"---\ndate: 2026-01-{i:02}\ntag: {tag}\n---\n# Post {i}"
+        )
+    (blog / "draft.md").write_text("---\ntag: odd\n---\n# Draft")
+    return Pages(root)
+
+
+def test_section(pages):
+    collection = pages.collection("blog")
+    assert len(collection) == 26
+    assert "blog" not in collection.request_paths
+    assert "about" not in collection.request_paths
+
+
+def test_order_by(pages):
+    collection = pages.collection("blog").order_by("-date")
+    assert collection.ordered
+    assert collection.request_paths[:2] == ("blog/post-25", "blog/post-24")
+
+    # Missing values are last
+    assert collection.request_paths[-1] == "blog/draft"
+    assert pages.collection("blog").order_by("date").request_paths[-1] == "blog/draft"
+
+
+def test_order_by_multiple(pages):
+    collection = pages.collection("blog").order_by("tag", "-date")
+    assert collection.request_paths[:2] == ("blog/post-24", "blog/post-22")
+    assert collection.request_paths[12:14] == ("blog/post-25", "blog/post-23")
+
+
+def test_filter(pages):
+    collection = pages.collection("blog").filter(tag="even").order_by("date")
+    assert collection.count() == 12
+    assert collection[0].request_path == "blog/post-02"
+
+    collection = pages.collection("blog").filter(date__gte="2026-01-20")
+    assert collection.count() == 6
+
+    collection = pages.collection("blog").filter(date__in=["2026-01-01", "2026-01-03"])
+    assert collection.request_paths == ("blog/post-01", "blog/post-03")
+
+
+def test_filter_unknown_lookup(pages):
+    with pytest.raises(ValueError):
+        pages.collection("blog").filter(date__between=1)
+
+
+def test_slice_only_reads_slice(pages):
+    collection = pages.collection("blog").order_by("-date")
+    collection.request_paths
+
+    with patch.object(pages.source, "read_text", wraps=pages.source.read_text) as read:
+        posts = collection[:5]
+        assert [post.title for post in posts] == [
+            f"Post {i}" for i in range(25, 20, -1)
+        ]
+    assert read.call_count == 5
+
+
+def test_paths_cached(pages):
+    collection = pages.collection("blog").order_by("-date")
+    paths = collection.request_paths
+    assert pages.collection("blog").filter(tag="odd").count() == 14
+
+    with patch.object(pages, "get_page_infos") as get_page_infos:
+        assert pages.collection("blog").order_by("-date").request_paths is paths
+        assert pages.collection("blog").filter(tag="even").count() == 12
+    get_page_infos.assert_not_called()
+
+    pages.invalidate()
+    assert pages.collection("blog").order_by("-date").request_paths is not paths
+
+
+def test_paginator(pages):
+    paginator = Paginator(pages.collection("blog").order_by("-date"), 10)
+    assert paginator.count == 26
+    assert paginator.num_pages == 3
+
+    page = paginator.page(3)
+    assert [post.request_path for post in page] == [
+        "blog/post-05",
+        "blog/post-04",
+        "blog/post-03",
+        "blog/post-02",
+        "blog/post-01",
+        "blog/draft",
+    ]
+
+
+def test_page_collection(pages):
+    page = pages.get_page("blog")
+    assert page.collection.ordering == ("-date",)
+    assert page.collection[0].request_path == "blog/post-25"
+
+
+def test_order_by_page_data(pages):
+    (pages.path / "blog" / "post-03.md").write_text("# Post 3\n\nA longer post.")
+    pages.invalidate()
+    collection = pages.collection("blog").order_by("-word_count", "date")
+    assert collection.request_paths[:2] == ("blog/post-03", "blog/post-01")
+
+    infos = pages.get_page_infos(fields=["excerpt", "word_count"])
+    info = next(info for info in infos if info.request_path == "blog/post-03")
+    assert info.excerpt == "A longer post."
+    assert info.word_count == 5
@@ -0,0 +1,140 @@
+import os
+
+import pytest
+from django.template import Context, Template
+from django.template.loader import get_template
+from django.test import RequestFactory
+
+from django_nanopages.deps import TemplateDependencies, track_templates
+from django_nanopages.pages import Pages
+from django_nanopages.views import PageView
+
+
+@pytest.fixture
+def templates_dir(tmp_path, settings):
+    templates_dir = tmp_path / "templates"
+    templates_dir.mkdir()
+    (templates_dir / "base.html").write_text(
+        "<main>{% block content %}{% endblock %}</main>"
+    )
+    (templates_dir / "other.html").write_text(
+        "<div>{% block content %}{% endblock %}</div>"
+    )
+    (templates_dir / "nav.html").write_text("<nav>Nav</nav>")
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "DIRS": [templates_dir],
+            "OPTIONS": {
+                "loaders": ["django.template.loaders.filesystem.Loader"],
+            },
+        }
+    ]
+    return templates_dir
+
+
+@pytest.fixture
+def pages(tmp_path, settings, templates_dir):
+    settings.BASE_DIR = tmp_path
+    root = tmp_path / "pages"
+    root.mkdir()
+    (root / "one.html").write_text(
+        '{% extends "base.html" %}{% block content %}One'
+        '{% include "nav.html" %}{% endblock %}'
+    )
+    (root / "two.html").write_text(
+        '{% extends "other.html" %}{% block content %}Two{% endblock %}'
+    )
+    return Pages(root, render_cache=True)
+
+
+def render(pages, request_path):
+    view = PageView(pages=pages)
+    view.request = RequestFactory().get(f"/{request_path}/")
+    return view.get(view.request, request_path=request_path)
+
+
+def test_track_templates(templates_dir):
+    with track_templates() as templates:
+        get_template("base.html").render({})
+        Template('{% include "nav.html" %}').render(Context())
+
+    assert templates == {
+        str(templates_dir / "base.html"),
+        str(templates_dir / "nav.html"),
+    }
+
+
+def test_track_templates__only_within_block(templates_dir):
+    with track_templates() as templates:
+        pass
+    get_template("base.html").render({})
+    assert templates == set()
+
+
+def test_dependencies__record():
+    deps = TemplateDependencies()
+    deps.record("one", {"base.html", "nav.html"})
+    deps.record("two", {"base.html"})
+    assert deps.get_dependents("base.html") == {"one", "two"}
+    assert deps.get_dependents("nav.html") == {"one"}
+
+    deps.record("one", {"other.html"})
+    assert deps.get_dependents("base.html") == {"two"}
+    assert deps.get_dependents("nav.html") == set()
+    assert deps.get_dependents("other.html") == {"one"}
+
+    deps.discard("two")
+    assert "two" not in deps
+    assert deps.dependents == {"other.html": {"one"}}
+
+
+def test_dependencies__version(templates_dir):
+    deps = TemplateDependencies()
+    assert deps.get_version("one") is None
+
+    base = templates_dir / "base.html"
+    deps.record("one", {str(base)})
+    version = deps.get_version("one")
+    os.utime(base, ns=(version[0] + 10**9, version[0] + 10**9))
+    assert deps.get_version("one") != version
+
+
+def test_render_cache__records_dependencies(pages, templates_dir):
+    response = render(pages, "one")
+    assert response.content == b"<main>One<nav>Nav</nav></main>"
+    assert pages.templates.get_dependents(templates_dir / "nav.html") == {"one"}
+    assert pages.templates.get_dependents(templates_dir / "base.html") == {"one"}
+    assert ("render", "one") in pages.cache
+
+
+def test_render_cache__hit(pages, monkeypatch):
+    render(pages, "one")
+
+    def fail(self, page):
+        raise AssertionError("Page rendered")
+
+    monkeypatch.setattr(PageView, "render_page", fail)
+    response = render(pages, "one")
+    assert response.content == b"<main>One<nav>Nav</nav></main>"
+
+
+def test_render_cache__template_changed(pages, templates_dir):
+    render(pages, "one")
+    nav = templates_dir / "nav.html"
+    nav.write_text("<nav>Changed</nav>")
+    mtime = nav.stat().st_mtime_ns + 10**9
+    os.utime(nav, ns=(mtime, mtime))
+
+    response = render(pages, "one")
+    assert response.content == b"<main>One<nav>Changed</nav></main>"
+
+
+def test_invalidate_template__only_dependents(pages, templates_dir):
+    render(pages, "one")
+    render(pages, "two")
+
+    assert pages.invalidate_template(templates_dir / "nav.html") == {"one"}
+    assert ("render", "one") not in pages.cache
+    assert ("render", "two") in pages.cache
+    assert "one" not in pages.templates
@@ -62,3 +62,9 @@ def test_example__blog_work(example):
     status, html = get(f"http://{TEST_BIND}/blog/work/")
     assert status == 200
     assert "<p>All work and no play makes Jack a dull boy. All work and no play" in html
+
+
+def test_example__blog_index_posts(example):
+    status, html = get(f"http://{TEST_BIND}/blog/")
+    assert status == 200
+    assert html.index("/blog/cookies/") < html.index("/blog/work/")
@@ -0,0 +1,86 @@
+from django_nanopages.extract import (
+    EMPTY_DATA,
+    Heading,
+    convert,
+    create_converter,
+    get_excerpt,
+    get_toc,
+)
+
+
+BODY = """# Title
+
+First paragraph with *emphasis* and `code`.
+
+## Install
+
+Second paragraph.
+
+### From source
+
+## Install
+
+<div>Raw HTML</div>
+"""
+
+
+def test_convert():
+    html, data = convert(BODY)
+
+    # Top-level heading is unchanged, others get anchors
+    assert html.startswith("<h1>Title</h1>")
+    assert '<h2 id="install">Install</h2>' in html
+    assert '<h3 id="from-source">From source</h3>' in html
+    assert '<h2 id="install_1">Install</h2>' in html
+    assert "<div>Raw HTML</div>" in html
+
+    assert data.headings == (
+        Heading(1, "Title", ""),
+        Heading(2, "Install", "install"),
+        Heading(3, "From source", "from-source"),
+        Heading(2, "Install", "install_1"),
+    )
+    assert data.excerpt == "First paragraph with emphasis and code."
+    assert data.word_count == 13
+    assert data.toc == (
+        '<ul><li><a href="#install">Install</a>'
+        '<ul><li><a href="#from-source">From source</a></li></ul></li>'
+        '<li><a href="#install_1">Install</a></li></ul>'
+    )
+
+
+def test_convert__existing_id():
+    converter = create_converter()
+    converter.registerExtensions(["attr_list"], {})
+    html, data = convert("## Setup {#custom}", converter)
+    assert '<h2 id="custom">Setup</h2>' in html
+    assert data.headings == (Heading(2, "Setup", "custom"),)
+
+
+def test_convert__empty():
+    assert convert("") == ("", EMPTY_DATA)
+
+
+def test_convert__reuse_converter():
+    converter = create_converter()
+    _, first = convert("## One\n\nOne two", converter)
+    _, second = convert("Three", converter)
+    assert second.headings == ()
+    assert second.word_count == 1
+
+
+def test_get_excerpt():
+    assert get_excerpt("one two three", words=3) == "one two three"
+    assert get_excerpt("one two three four", words=3) == "one two three…"
+
+
+def test_get_toc__skipped_levels():
+    headings = (
+        Heading(2, "A", "a"),
+        Heading(4, "B", "b"),
+        Heading(3, "C & D", "c"),
+    )
+    assert get_toc(headings) == (
+        '<ul><li><a href="#a">A</a><ul><li><a href="#b">B</a></li></ul></li>'
+        '<li><a href="#c">C &amp; D</a></li></ul>'
+    )
@@ -0,0 +1,127 @@
+import os
+from types import ModuleType
+
+import pytest
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import path, resolve
+
+from django_nanopages.feeds import SitemapView, to_datetime
+from django_nanopages.pages import Pages
+
+
+@pytest.fixture
+def pages(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    root = tmp_path / "pages"
+    blog = root / "blog"
+    blog.mkdir(parents=True)
+    (root / "index.md").write_text("# Home")
+    (root / "about.md").write_text("# About")
+    (blog / "index.md").write_text("# Blog")
+    (blog / "old.md").write_text("---\ntitle: Old post\ndate: 2026-01-01\n---\n# Old")
+    (blog / "new.md").write_text(
+        "---\ntitle: New post\ndate: 2026-02-01\nsummary: Latest news\n---\n# New"
+    )
+    for name in ["index.md", "about.md", "blog/index.md", "blog/old.md"]:
+        os.utime(root / name, (1767225600, 1767225600))
+
+    pages = Pages(root, context={"site_title": "Test site"}, sitemap=True, feed="blog")
+    settings.ROOT_URLCONF = make_urlconf([path("site/", pages)])
+    return pages
+
+
+def make_urlconf(urlpatterns):
+    urlconf = ModuleType("urlconf")
+    urlconf.urlpatterns = urlpatterns
+    return urlconf
+
+
+def get(url, **headers):
+    request = RequestFactory().get(url, **headers)
+    match = resolve(url)
+    try:
+        return match.func(request, *match.args, **match.kwargs)
+    except Http404:
+        return None
+
+
+def test_to_datetime():
+    assert to_datetime("2026-01-02", 0).isoformat() == "2026-01-02T00:00:00+00:00"
+    assert to_datetime("2026-01-02T03:04:05", 0).hour == 3
+    assert to_datetime(None, 0).year == 1970
+    assert to_datetime("not a date", 0).year == 1970
+
+
+def test_sitemap(pages):
+    response = get("/site/sitemap.xml")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/xml"
+
+    content = response.content.decode()
+    assert "<urlset" in content
+    assert "<loc>http://testserver/site/</loc>" in content
+    assert "<loc>http://testserver/site/blog/old/</loc>" in content
+    assert "<lastmod>2026-01-01</lastmod>" in content
+    assert content.count("<url>") == 5
+
+
+def test_sitemap_cached(pages):
+    content = get("/site/sitemap.xml").content
+
+    # New pages aren't seen until invalidated
+    (pages.path / "contact.md").write_text("# Contact")
+    assert get("/site/sitemap.xml").content == content
+
+    pages.invalidate()
+    assert b"/site/contact/" in get("/site/sitemap.xml").content
+
+
+def test_sitemap_conditional_get(pages):
+    response = get("/site/sitemap.xml")
+    etag = response["ETag"]
+    assert response["Last-Modified"]
+
+    response = get("/site/sitemap.xml", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = get(
+        "/site/sitemap.xml", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert response.status_code == 304
+
+
+def test_sitemap_index(pages, monkeypatch):
+    monkeypatch.setattr(SitemapView, "limit", 2)
+
+    content = get("/site/sitemap.xml").content.decode()
+    assert "<sitemapindex" in content
+    assert "<loc>http://testserver/site/sitemap-3.xml</loc>" in content
+    assert "sitemap-4.xml" not in content
+
+    content = get("/site/sitemap-3.xml").content.decode()
+    assert content.count("<url>") == 1
+    assert get("/site/sitemap-4.xml") is None
+
+
+def test_feed(pages):
+    response = get("/site/feed.xml")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/atom+xml; charset=utf-8"
+
+    content = response.content.decode()
+    assert "<title>Test site</title>" in content
+    assert content.index("New post") < content.index("Old post")
+    assert '<summary type="html">Latest news</summary>' in content
+    assert "<published>2026-02-01T00:00:00+00:00</published>" in content
+    assert "/site/about/" not in content
+
+
+def test_no_sitemap_or_feed_by_default(pages, settings):
+    pages = Pages(pages.path, name="plain")
+    settings.ROOT_URLCONF = make_urlconf([path("", pages)])
+    with pytest.raises(Http404):
+        resolve("/sitemap.xml")
+    with pytest.raises(Http404):
+        resolve("/feed.xml")
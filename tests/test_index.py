@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from django_nanopages.index import PageIndex, get_request_path
+from django_nanopages.sources import DirectorySource
+
+
+def test_get_request_path():
+    assert get_request_path("about.md") == ("about", 1)
+    assert get_request_path("blog/post.html") == ("blog/post", 0)
+    assert get_request_path("index.md") == ("", 3)
+    assert get_request_path("blog/index.html") == ("blog", 2)
+    assert get_request_path("logo.png") is None
+    assert get_request_path(".md") is None
+
+
+def test_build(tmp_path):
+    (tmp_path / "index.md").write_text("# Home")
+    (tmp_path / "about.md").write_text("# About")
+    (tmp_path / "logo.png").write_bytes(b"")
+    blog = tmp_path / "blog"
+    blog.mkdir()
+    (blog / "index.md").write_text("# Blog")
+    (blog / "post.md").write_text("# Post")
+
+    index = PageIndex.build(DirectorySource(tmp_path))
+    assert list(index) == ["", "about", "blog", "blog/post"]
+    assert index["blog/post"] == blog / "post.md"
+
+
+def test_build_precedence(tmp_path):
+    # Matches the search order of Page.find_src
+    (tmp_path / "page.md").write_text("# Page")
+    (tmp_path / "page.html").write_text("<h1>Page</h1>")
+    page = tmp_path / "page"
+    page.mkdir()
+    (page / "index.html").write_text("<h1>Index</h1>")
+
+    index = PageIndex.build(DirectorySource(tmp_path))
+    assert index["page"] == tmp_path / "page.html"
+
+
+def test_build_missing_dir(tmp_path):
+    assert len(PageIndex.build(DirectorySource(tmp_path / "missing"))) == 0
+
+
+def test_immutable(tmp_path):
+    index = PageIndex({"a": Path("a.md")})
+    assert not hasattr(index, "__setitem__")
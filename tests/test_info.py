@@ -0,0 +1,84 @@
+import pickle
+
+import pytest
+
+from django_nanopages.extract import convert
+from django_nanopages.info import PageInfo
+from django_nanopages.page import read_frontmatter
+from django_nanopages.sources import DirectorySource
+
+
+def test_from_src(tmp_path):
+    src = tmp_path / "first-post.md"
+    src.write_text("---\ndate: 2026-01-01\nauthor: Me\n---\n# Post")
+
+    info = PageInfo.from_src(
+        DirectorySource(tmp_path), "blog/first-post", src, fields=["date", "tags"]
+    )
+    assert info.request_path == "blog/first-post"
+    assert info.src == str(src)
+    assert info.size == src.stat().st_size
+    assert info.mtime == src.stat().st_mtime
+    assert info.title == "First Post"
+    assert info.fields == (("date", "2026-01-01"), ("tags", None))
+
+
+def test_from_src_data(tmp_path):
+    src = tmp_path / "post.md"
+    src.write_text("---\nexcerpt: Ignored\n---\n# Post\n\nHello world")
+    _, data = convert("# Post\n\nHello world")
+
+    info = PageInfo.from_src(
+        DirectorySource(tmp_path), "post", src, ["excerpt", "word_count"], data
+    )
+    assert info.fields == (("excerpt", "Hello world"), ("word_count", 3))
+
+
+def test_from_src_title(tmp_path):
+    src = tmp_path / "post.md"
+    src.write_text("---\ntitle: Hello\n---\n# Post")
+
+    info = PageInfo.from_src(DirectorySource(tmp_path), "post", src)
+    assert info.title == "Hello"
+    assert info.fields == ()
+
+
+def test_field_access():
+    info = PageInfo("post", "post.md", 0, 0, "Post", (("date", "2026-01-01"),))
+    assert info.date == "2026-01-01"
+    assert info.get("date") == "2026-01-01"
+    assert info.get("missing", "default") == "default"
+    with pytest.raises(AttributeError):
+        info.missing
+
+
+def test_immutable():
+    info = PageInfo("post", "post.md", 0, 0, "Post")
+    assert not hasattr(info, "__dict__")
+    with pytest.raises(AttributeError):
+        info.title = "Changed"
+    with pytest.raises(AttributeError):
+        del info.title
+
+
+def test_pickle():
+    info = PageInfo("post", "post.md", 0, 0, "Post", (("date", "2026-01-01"),))
+    assert pickle.loads(pickle.dumps(info)) == info
+
+
+def test_read_frontmatter_stops_at_body(tmp_path):
+    src = tmp_path / "post.md"
+    src.write_text("---\nkey: value\n---\n---\nnot: frontmatter\n")
+    with src.open() as file:
+        assert read_frontmatter(file) == {"key": "value"}
+
+
+def test_read_frontmatter_none(tmp_path):
+    src = tmp_path / "post.md"
+    src.write_text("# Post\nkey: value\n")
+    with src.open() as file:
+        assert read_frontmatter(file) == {}
+
+    src.write_text("---\nkey: value\n")
+    with src.open() as file:
+        assert read_frontmatter(file) == {}
@@ -0,0 +1,100 @@
+import pytest
+
+from django_nanopages.nav import sort_key
+from django_nanopages.pages import Pages
+
+
+@pytest.fixture
+def pages(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    root = tmp_path / "pages"
+    files = {
+        "index.md": "# Home",
+        "about.md": "---\norder: 2\n---\n# About",
+        "contact.md": "---\norder: 1\n---\n# Contact",
+        "blog/index.md": "# Blog",
+        "blog/second.md": "---\ntitle: Second\norder: 2\n---\n# Second",
+        "blog/first.md": "---\norder: 1\n---\n# First",
+        "docs/guide/intro.md": "# Intro",
+    }
+    for name, content in files.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(content)
+    return Pages(root)
+
+
+def test_sort_key():
+    values = ["b", None, 10, "2", "a", 1.5]
+    assert sorted(values, key=sort_key) == [1.5, "2", 10, "a", "b", None]
+
+
+def test_tree(pages):
+    nav = pages.nav
+    assert [node.request_path for node in nav.roots] == [""]
+
+    root = nav[""]
+    assert root.is_section
+    assert [node.request_path for node in root.children] == [
+        "contact",
+        "about",
+        "blog",
+        "docs/guide/intro",
+    ]
+
+    blog = nav["blog"]
+    assert blog.is_section
+    assert blog.parent is root
+    assert [node.title for node in blog.children] == ["First", "Second"]
+
+
+def test_page_relations(pages):
+    page = pages.get_page("blog/first")
+    assert page.parent.request_path == "blog"
+    assert page.children == ()
+    assert [node.request_path for node in page.siblings] == ["blog/second"]
+    assert page.next.request_path == "blog/second"
+    assert page.prev is None
+    assert page.next.prev.request_path == "blog/first"
+    assert page.next.page.title == "Second"
+
+
+def test_nearest_ancestor(pages):
+    # docs/ has no index, so the nearest ancestor is the root
+    page = pages.get_page("docs/guide/intro")
+    assert page.parent.request_path == ""
+
+
+def test_no_root_index(pages):
+    (pages.path / "index.md").unlink()
+    pages.invalidate()
+
+    assert [node.request_path for node in pages.nav.roots] == [
+        "contact",
+        "about",
+        "blog",
+        "docs/guide/intro",
+    ]
+    page = pages.get_page("about")
+    assert page.parent is None
+    assert [node.request_path for node in page.siblings] == [
+        "contact",
+        "blog",
+        "docs/guide/intro",
+    ]
+
+
+def test_invalidate(pages):
+    nav = pages.nav
+    assert pages.nav is nav
+
+    pages.invalidate()
+    assert pages.nav is not nav
+
+
+def test_order_key(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    (tmp_path / "a.md").write_text("---\nweight: 2\n---\n# A")
+    (tmp_path / "b.md").write_text("---\nweight: 1\n---\n# B")
+
+    pages = Pages(tmp_path, name="weighted", nav_order="weight")
+    assert [node.request_path for node in pages.nav.roots] == ["b", "a"]
@@ -3,7 +3,9 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from django_nanopages.page import Page
+from django_nanopages.cache import PageCache
+from django_nanopages.page import Page, _parse_frontmatter, parse_frontmatter
+from django_nanopages.sources import DirectorySource
 
 
 @pytest.fixture
@@ -11,6 +13,9 @@ def pages_mock(tmp_path):
     pages = MagicMock()
     pages.path = tmp_path
     pages.context = None
+    pages.cache = PageCache()
+    pages.source = DirectorySource(tmp_path)
+    pages.markdown_pool = None
     return pages
 
 
@@ -140,6 +145,24 @@ def test_read_with_json_frontmatter(pages_mock):
     assert context == {"base": "django_nanopages/page.html", "key": "value"}
 
 
+def test_parse_frontmatter__cached():
+    _parse_frontmatter.cache_clear()
+    first = parse_frontmatter("yaml", "key: value\ndate: 2026-01-01")
+    second = parse_frontmatter("yaml", "key: value\ndate: 2026-01-01")
+
+    assert first == second
+    assert first is not second
+    assert str(first["date"]) == "2026-01-01"
+    assert _parse_frontmatter.cache_info().hits == 1
+
+
+def test_parse_frontmatter__invalid():
+    with pytest.raises(ValueError):
+        parse_frontmatter("toml", "key = 'value'")
+    with pytest.raises(ValueError):
+        parse_frontmatter("yaml", "- not a dict")
+
+
 def test_as_html_md(pages_mock):
     md_file = pages_mock.path / "test.md"
     md_file.write_text("---\nkey: value\n---\n# Test Markdown")
@@ -269,3 +292,57 @@ def test_name_nested_index_page(pages_mock):
 
     page = Page(request_path="blog", pages=pages_mock)
     assert page.name == "blog"
+
+
+def test_read_shared_cache(pages_mock):
+    test_file = pages_mock.path / "test.md"
+    test_file.write_text("---\nkey: value\n---\n# Test")
+
+    Page(request_path="test", pages=pages_mock).as_html()
+    assert pages_mock.cache.stats()["entries"] == 2
+
+    # A new page object should be served from the cache
+    page = Page(request_path="test", pages=pages_mock)
+    assert page.as_html() == "<h1>Test</h1>"
+    assert pages_mock.cache.stats()["hits"] == 2
+
+    # Contexts are not shared between page objects
+    page.context["page"] = page
+    assert "page" not in Page(request_path="test", pages=pages_mock).context
+
+
+def test_read_shared_cache_invalidated_on_change(pages_mock):
+    test_file = pages_mock.path / "test.md"
+    test_file.write_text("# Test")
+    assert Page(request_path="test", pages=pages_mock).as_html() == "<h1>Test</h1>"
+
+    test_file.write_text("# Updated page")
+    assert (
+        Page(request_path="test", pages=pages_mock).as_html() == "<h1>Updated page</h1>"
+    )
+
+
+def test_page_data(pages_mock):
+    test_file = pages_mock.path / "test.md"
+    test_file.write_text("# Test\n\nSome words here.\n\n## Section\n\nMore.")
+
+    page = Page(request_path="test", pages=pages_mock)
+    assert page.word_count == 6
+    assert page.excerpt == "Some words here."
+    assert [heading.text for heading in page.headings] == ["Test", "Section"]
+    assert page.toc == '<ul><li><a href="#section">Section</a></li></ul>'
+    assert '<h2 id="section">Section</h2>' in page.as_html()
+
+    # Cached with the HTML
+    assert pages_mock.cache.stats()["entries"] == 2
+    page = Page(request_path="test", pages=pages_mock)
+    assert page.word_count == 6
+    assert pages_mock.cache.stats()["hits"] == 2
+
+
+def test_page_data_html(pages_mock):
+    (pages_mock.path / "test.html").write_text("<h1>Test</h1>")
+    page = Page(request_path="test", pages=pages_mock)
+    assert page.headings == ()
+    assert page.word_count == 0
+    assert page.toc == ""
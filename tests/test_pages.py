@@ -65,3 +65,120 @@ def test_get_page_with_subdirectory(pages_dir):
 
     assert page is not None
     assert page.src == md_file
+
+
+def test_cache_size(pages_dir):
+    (pages_dir / "test.md").write_text("# Test")
+
+    pages = Pages(pages_dir, cache_size=4000, cache_max_item_size=1000)
+    pages.get_page("test").as_html()
+
+    stats = pages.cache.stats()
+    assert stats["max_size"] == 4000
+    assert stats["max_item_size"] == 1000
+    assert stats["entries"] == 2
+    assert 0 < stats["size"] <= 4000
+
+
+def test_get_request_paths(pages_dir):
+    (pages_dir / "index.md").write_text("# Home")
+    (pages_dir / "about.md").write_text("# About")
+    (pages_dir / "about.html").write_text("<h1>About</h1>")
+    blog = pages_dir / "blog"
+    blog.mkdir()
+    (blog / "index.md").write_text("# Blog")
+    (blog / "post.md").write_text("# Post")
+
+    pages = Pages(pages_dir)
+    assert pages.get_request_paths() == ["about", "blog", "blog/post"]
+
+
+def test_get_page_uses_index(pages_dir, monkeypatch):
+    (pages_dir / "test.md").write_text("# Test")
+
+    pages = Pages(pages_dir)
+    assert "test" in pages.index
+
+    # Indexed pages are found without searching the filesystem
+    def find(request_path):
+        raise AssertionError("Searched the filesystem")
+
+    monkeypatch.setattr(pages.source, "find", find)
+    assert pages.get_page("test") is not None
+
+    # New pages are still found, and rebuild the index
+    version = pages.version
+    monkeypatch.undo()
+    (pages_dir / "new.md").write_text("# New")
+    assert pages.get_page("new") is not None
+    assert pages.version == version + 1
+
+
+def test_get_page_removed(pages_dir):
+    (pages_dir / "test.md").write_text("# Test")
+
+    pages = Pages(pages_dir)
+    assert pages.get_page("test") is not None
+    version = pages.version
+
+    (pages_dir / "test.md").unlink()
+    assert pages.get_page("test") is None
+    assert pages.version == version + 1
+    assert "test" not in pages.index
+
+
+def test_index_refresh_interval(pages_dir):
+    (pages_dir / "test.md").write_text("# Test")
+
+    pages = Pages(pages_dir, index_refresh_interval=60)
+    assert pages.get_page("test") is not None
+
+    (pages_dir / "new.md").write_text("# New")
+    assert "new" not in pages.get_request_paths()
+
+    pages.snapshot.created -= 61
+    assert "new" in pages.get_request_paths()
+
+
+def test_get_page_checks_filesystem(pages_dir):
+    (pages_dir / "test.md").write_text("# Test")
+
+    pages = Pages(pages_dir)
+    assert pages.get_page("test") is not None
+
+    (pages_dir / "new.md").write_text("# New")
+    assert pages.get_page("new") is not None
+    assert "new" in pages.index
+
+    (pages_dir / "test.md").unlink()
+    assert pages.get_page("test") is None
+    assert "test" not in pages.index
+
+
+def test_preload(pages_dir):
+    (pages_dir / "index.md").write_text("# Home")
+    (pages_dir / "about.html").write_text("<h1>About</h1>")
+
+    pages = Pages(pages_dir)
+    stats = pages.preload(freeze=False)
+
+    # Markdown pages cache the source and HTML, HTML pages only the source
+    assert stats["entries"] == 3
+    assert stats["frozen"] == 3
+    assert stats["evictions"] == 0
+
+    pages.get_page("").as_html()
+    assert pages.cache.stats()["misses"] == stats["misses"]
+
+
+def test_get_page_infos(pages_dir):
+    (pages_dir / "index.md").write_text("---\ntitle: Home\n---\n# Home")
+    (pages_dir / "post.md").write_text("---\ndate: 2026-01-01\n---\n# Post")
+
+    pages = Pages(pages_dir)
+    infos = pages.get_page_infos(fields=["date"])
+
+    assert [info.request_path for info in infos] == ["", "post"]
+    assert infos[0].title == "Home"
+    assert infos[1].date == "2026-01-01"
+    assert len(pages.cache) == 0
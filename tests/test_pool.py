@@ -0,0 +1,109 @@
+import pytest
+
+from django_nanopages.extract import EMPTY_DATA
+from django_nanopages.pages import Pages
+from django_nanopages.pool import MarkdownPool, convert_page
+
+
+@pytest.fixture
+def pool():
+    pool = MarkdownPool(processes=1, threshold=100)
+    yield pool
+    pool.shutdown()
+
+
+def test_convert_page():
+    html, data = convert_page("# Title")
+    assert html == "<h1>Title</h1>"
+    assert data.word_count == 1
+
+    # Converter is reset between conversions
+    assert convert_page("Text")[0] == "<p>Text</p>"
+    assert convert_page("") == ("", EMPTY_DATA)
+
+
+def test_pool__small_in_thread(pool):
+    assert pool.convert_page("# Small")[0] == "<h1>Small</h1>"
+    assert pool._executor is None
+
+
+def test_pool__large_in_process(pool):
+    body = "# Large\n\n## Table\n\n" + "| a | b |\n" * 20
+    assert pool.convert_page(body) == convert_page(body)
+    assert pool._executor is not None
+
+
+def test_pool__restarts_after_fork(pool):
+    executor = pool.executor
+    pool._pid = -1
+    assert pool.executor is not executor
+    executor.shutdown()
+
+
+def test_pool__start(pool):
+    pool.processes = 2
+    pool.start()
+    assert len(pool._executor._processes) == 2
+
+
+def test_pool__started_after_fork(pool):
+    pool.start()
+    executor = pool._executor
+
+    # As if in a forked child process
+    pool.after_fork()
+    pool.thread.join(30)
+    assert pool._executor is not None
+    assert pool._executor is not executor
+    executor.shutdown()
+
+
+def test_pool__not_started_after_fork(pool):
+    pool.after_fork()
+    assert pool.thread is None
+    assert pool._executor is None
+
+
+def test_pages_markdown_pool_preload(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    (tmp_path / "index.md").write_text("# Home")
+
+    pages = Pages(tmp_path, markdown_processes=1, markdown_process_threshold=1)
+    pool = pages.markdown_pool
+    try:
+        # Workers used while preloading are stopped in the master process
+        pages.preload(freeze=False)
+        assert pool._executor is None
+
+        # As if in a forked child process
+        pool.after_fork()
+        pool.thread.join(30)
+        assert len(pool._executor._processes) == 1
+    finally:
+        pool.shutdown()
+
+
+def test_pages_markdown_pool(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    root = tmp_path / "pages"
+    root.mkdir()
+    (root / "large.md").write_text("# Large\n\n" + "Lorem ipsum. " * 20)
+
+    pages = Pages(root, markdown_processes=1, markdown_process_threshold=100)
+    try:
+        page = pages.get_page("large")
+        html = page.as_html()
+        assert html.startswith("<h1>Large</h1>")
+        assert pages.markdown_pool._executor is not None
+
+        # Result is cached with the page data
+        key = ("html", str(page.src))
+        assert pages.cache.get(key, page.get_token()) == (html, page.data)
+        assert page.word_count == 41
+    finally:
+        pages.markdown_pool.shutdown()
+
+
+def test_pages_markdown_pool_disabled(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    assert Pages(tmp_path).markdown_pool is None
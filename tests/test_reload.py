@@ -0,0 +1,151 @@
+import threading
+from pathlib import Path
+
+import pytest
+from django.core.files.storage import FileSystemStorage
+from django.utils.autoreload import StatReloader
+
+from django_nanopages.pages import Pages
+from django_nanopages.reload import ReloadDebouncer
+
+
+FILES = [
+    "index.md",
+    "about.html",
+    "logo.png",
+    "blog/post.md",
+    "blog/images/photo.jpg",
+    "blog/.draft.md",
+    "node_modules/pkg/README.md",
+    ".git/HEAD",
+]
+
+
+class Reloader:
+    """
+    Records what an autoreloader is asked to watch
+    """
+
+    def __init__(self):
+        self.globs = []
+        self.extra_files = set()
+
+    def watch_dir(self, path, glob):
+        self.globs.append((Path(path), glob))
+
+
+@pytest.fixture
+def pages_dir(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    pages_path = tmp_path / "pages"
+    for name in FILES:
+        (pages_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (pages_path / name).write_text("")
+    return pages_path
+
+
+def test_watch__page_suffixes_only(pages_dir):
+    pages = Pages("pages")
+    reloader = Reloader()
+    pages.watch(reloader)
+
+    # Ignored dirs are not registered, so they are never walked
+    dirs = [pages_dir, pages_dir / "blog", pages_dir / "blog" / "images"]
+    assert sorted(reloader.globs) == sorted(
+        (dir_path, glob) for dir_path in dirs for glob in ["*.html", "*.md"]
+    )
+    assert reloader.extra_files == set(dirs)
+
+
+def test_watch__new_dir(pages_dir):
+    pages = Pages("pages")
+    reloader = StatReloader()
+    pages.watch(reloader)
+    watched = set(reloader.watched_files())
+    assert pages_dir / "blog" / "post.md" in watched
+    assert pages_dir / "logo.png" not in watched
+    assert pages_dir / "node_modules" / "pkg" / "README.md" not in watched
+
+    # The parent dir changes, and is registered again
+    (pages_dir / "news").mkdir()
+    (pages_dir / "news" / "post.md").write_text("")
+    assert pages_dir in watched
+    assert pages.is_watched(pages_dir)
+    pages.watch(reloader)
+    assert pages_dir / "news" / "post.md" in set(reloader.watched_files())
+
+
+def test_is_watched__ignore(pages_dir):
+    pages = Pages("pages", watch_ignore=["blog"])
+    assert not pages.is_watched(pages_dir / "blog" / "post.md")
+    assert pages.is_watched(pages_dir / "node_modules" / "pkg" / "README.md")
+
+
+def test_is_watched(pages_dir, tmp_path):
+    pages = Pages("pages")
+    assert pages.is_watched(pages_dir / "index.md")
+    assert pages.is_watched(pages_dir / "blog" / "post.md")
+    assert not pages.is_watched(pages_dir / "logo.png")
+    assert not pages.is_watched(pages_dir / "blog" / ".draft.md")
+    assert not pages.is_watched(pages_dir / "node_modules" / "pkg" / "README.md")
+    assert not pages.is_watched(tmp_path / "templates" / "base.html")
+
+
+def test_is_watched__storage(tmp_path):
+    location = tmp_path / "storage"
+    (location / "blog").mkdir(parents=True)
+    pages = Pages(FileSystemStorage(location), name="content")
+    reloader = Reloader()
+    pages.watch(reloader)
+
+    assert reloader.extra_files == {location, location / "blog"}
+    assert pages.is_watched(location / "blog" / "post.md")
+    assert not pages.is_watched(location / "logo.png")
+
+
+def test_is_watched__prebuilt(pages_dir):
+    (pages_dir / "out" / "about").mkdir(parents=True)
+    pages = Pages("pages", prebuilt="pages/out")
+    reloader = Reloader()
+    pages.watch(reloader)
+    assert pages_dir / "out" not in reloader.extra_files
+
+    assert not pages.is_watched(pages_dir / "out" / "about" / "index.html")
+    assert pages.is_watched(pages_dir / "about.html")
+
+
+def test_debouncer__once_per_burst(pages_dir, tmp_path):
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    pages = Pages("pages")
+    other = Pages("other")
+    reloads = []
+    debouncer = ReloadDebouncer(lambda: reloads.append(True), delay=60)
+
+    version = pages.version
+    for _ in range(100):
+        debouncer.add(pages)
+    debouncer.add(other)
+
+    # Waits for changes to settle
+    assert pages.version == version
+    assert reloads == []
+
+    debouncer.flush()
+    assert pages.version == version + 1
+    assert other.version == 1
+    assert reloads == [True]
+    assert debouncer.timer is None
+
+    # Nothing pending
+    debouncer.flush()
+    assert reloads == [True]
+
+
+def test_debouncer__timer(pages_dir):
+    pages = Pages("pages")
+    reloaded = threading.Event()
+    debouncer = ReloadDebouncer(reloaded.set, delay=0)
+    debouncer.add(pages)
+    assert reloaded.wait(5)
+    assert pages.version == 1
@@ -0,0 +1,215 @@
+import os
+
+import pytest
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.core.cache import caches
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory
+
+from django_nanopages.pages import Pages
+from django_nanopages.views import PageView
+
+
+@pytest.fixture
+def templates_dir(tmp_path, settings):
+    templates_dir = tmp_path / "templates"
+    templates_dir.mkdir()
+    (templates_dir / "base.html").write_text(
+        "<main>{% block content %}{% endblock %}</main>"
+    )
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "DIRS": [templates_dir],
+            "OPTIONS": {
+                "loaders": ["django.template.loaders.filesystem.Loader"],
+            },
+        }
+    ]
+    return templates_dir
+
+
+@pytest.fixture
+def root(tmp_path, settings, templates_dir):
+    settings.BASE_DIR = tmp_path
+    caches["default"].clear()
+    root = tmp_path / "pages"
+    root.mkdir()
+    (root / "one.html").write_text(
+        '{% extends "base.html" %}{% block content %}One{% endblock %}'
+    )
+    (root / "csrf.html").write_text("{% csrf_token %}")
+    return root
+
+
+@pytest.fixture
+def pages(root):
+    return Pages(root, response_cache="default")
+
+
+def get(pages, request_path, **extra):
+    request = RequestFactory().get(f"/{request_path}/", **extra)
+    view = PageView(pages=pages)
+    view.setup(request, request_path=request_path)
+    return view.get(request, request_path=request_path)
+
+
+def touch(path, content):
+    path.write_text(content)
+    mtime = path.stat().st_mtime_ns + 10**9
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_response_cache__hit(pages, monkeypatch):
+    assert get(pages, "one").content == b"<main>One</main>"
+
+    def fail(self, request_path):
+        raise AssertionError("Page constructed")
+
+    monkeypatch.setattr(Pages, "get_page", fail)
+    response = get(pages, "one")
+    assert response.content == b"<main>One</main>"
+    assert response["Content-Type"] == "text/html; charset=utf-8"
+
+
+def test_response_cache__source_changed(pages, root):
+    get(pages, "one")
+    touch(root / "one.html", "Changed")
+    assert get(pages, "one").content == b"Changed"
+
+
+def test_response_cache__template_changed(pages, templates_dir):
+    get(pages, "one")
+    touch(templates_dir / "base.html", "<div>{% block content %}{% endblock %}</div>")
+    assert get(pages, "one").content == b"<div>One</div>"
+
+
+def test_response_cache__context_changed(pages):
+    key = pages.response_cache.get_key(RequestFactory().get("/one/"), "one")
+    pages.context = {"site_title": "Changed"}
+    assert pages.response_cache.get_key(RequestFactory().get("/one/"), "one") != key
+
+
+def test_response_cache__index_changed(pages, root):
+    key = pages.response_cache.get_key(RequestFactory().get("/one/"), "one")
+    (root / "two.html").write_text("Two")
+    pages.invalidate()
+    assert pages.response_cache.get_key(RequestFactory().get("/one/"), "one") != key
+
+
+def test_response_cache__query_string_not_cached(pages):
+    request = RequestFactory().get("/one/?page=2")
+    assert pages.response_cache.get_key(request, "one") is None
+
+
+def test_response_cache__csrf_not_cached(pages):
+    get(pages, "csrf")
+    key = pages.response_cache.get_key(RequestFactory().get("/csrf/"), "csrf")
+    assert pages.response_cache.get(key) is None
+
+
+def test_response_cache__host(pages, settings):
+    settings.ALLOWED_HOSTS = ["testserver", "other.example"]
+    rf = RequestFactory()
+    key = pages.response_cache.get_key(rf.get("/one/"), "one")
+    assert pages.response_cache.get_key(rf.get("/one/", secure=True), "one") != key
+    other = rf.get("/one/", HTTP_HOST="other.example")
+    assert pages.response_cache.get_key(other, "one") != key
+
+
+def test_response_cache__session_not_cached(pages):
+    request = RequestFactory().get("/one/")
+    request.session = SessionStore()
+    request.session.get("user")
+    key = pages.response_cache.get_key(request, "one")
+    pages.response_cache.set(request, key, HttpResponse("Private"), [])
+    assert pages.response_cache.get(key) is None
+
+
+@pytest.mark.parametrize(
+    "header, value",
+    [
+        ("Cache-Control", "private, max-age=60"),
+        ("Cache-Control", "no-store"),
+        ("Vary", "Cookie"),
+    ],
+)
+def test_response_cache__private_not_cached(pages, header, value):
+    request = RequestFactory().get("/one/")
+    key = pages.response_cache.get_key(request, "one")
+    response = HttpResponse("Private")
+    response[header] = value
+    pages.response_cache.set(request, key, response, [])
+    assert pages.response_cache.get(key) is None
+
+
+def test_response_cache__missing_page(pages):
+    with pytest.raises(Http404):
+        get(pages, "missing")
+
+
+def test_response_cache__vary(root):
+    pages = Pages(
+        root, response_cache="default", response_cache_vary=["Accept-Language"]
+    )
+    en = get(pages, "one", HTTP_ACCEPT_LANGUAGE="en")
+    assert en["Vary"] == "Accept-Language"
+
+    rf = RequestFactory()
+    en_key = pages.response_cache.get_key(rf.get("/", HTTP_ACCEPT_LANGUAGE="en"), "one")
+    fr_key = pages.response_cache.get_key(rf.get("/", HTTP_ACCEPT_LANGUAGE="fr"), "one")
+    assert en_key != fr_key
+    assert pages.response_cache.get(en_key)["Vary"] == "Accept-Language"
+    assert pages.response_cache.get(fr_key) is None
+
+
+def test_response_cache__with_render_cache(root, templates_dir):
+    pages = Pages(root, response_cache="default", render_cache=True)
+    get(pages, "one")
+    caches["default"].clear()
+
+    # Response rebuilt from the render cache keeps its template dependencies
+    assert get(pages, "one").content == b"<main>One</main>"
+    touch(templates_dir / "base.html", "<div>{% block content %}{% endblock %}</div>")
+    assert get(pages, "one").content == b"<div>One</div>"
+
+
+@pytest.fixture
+def prebuilt(tmp_path, root):
+    prebuilt = tmp_path / "static_site"
+    (prebuilt / "one").mkdir(parents=True)
+    touch(prebuilt / "one/index.html", "<main>Prebuilt</main>")
+    return prebuilt
+
+
+def test_prebuilt__sendfile(root, prebuilt, monkeypatch):
+    pages = Pages(root, prebuilt="static_site")
+    monkeypatch.setattr(Pages, "get_page", lambda self, request_path: None)
+
+    response = get(pages, "one")
+    assert response.content == b""
+    assert response["X-Sendfile"] == str(prebuilt / "one/index.html")
+    assert "X-Accel-Redirect" not in response
+
+
+def test_prebuilt__accel_redirect(root, prebuilt):
+    pages = Pages(root, prebuilt=prebuilt, prebuilt_url="/_prebuilt/")
+    response = get(pages, "one")
+    assert response.content == b""
+    assert response["X-Accel-Redirect"] == "/_prebuilt/one/index.html"
+
+
+def test_prebuilt__stale_renders(root, prebuilt):
+    pages = Pages(root, prebuilt=prebuilt)
+    touch(root / "one.html", "Changed")
+    os.utime(prebuilt / "one/index.html", ns=(0, 0))
+    response = get(pages, "one")
+    assert response.content == b"Changed"
+    assert "X-Sendfile" not in response
+
+
+def test_prebuilt__missing_renders(root, prebuilt):
+    pages = Pages(root, prebuilt=prebuilt)
+    response = get(pages, "csrf")
+    assert response.content
+    assert "X-Sendfile" not in response
@@ -0,0 +1,122 @@
+import pytest
+
+from django_nanopages.pages import Pages
+from django_nanopages.search import get_snippet
+
+
+@pytest.fixture
+def pages(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    root = tmp_path / "pages"
+    root.mkdir()
+    (root / "index.md").write_text("# Home\n\nWelcome to the **cookie** site.")
+    (root / "cookies.md").write_text(
+        "---\ntitle: Cookie recipe\n---\n"
+        "Cream the butter and sugar. Bake the cookie dough. Cool the cookies."
+    )
+    (root / "bread.html").write_text(
+        "{% extends 'base.html' %}{% block content %}<p>Knead the dough.</p>"
+        "{% endblock %}"
+    )
+    return Pages(root)
+
+
+def test_search(pages):
+    results = pages.search("cookie")
+    assert [result.request_path for result in results] == ["cookies", ""]
+    assert results[0].title == "Cookie recipe"
+    assert results[0].score > results[1].score
+
+
+def test_search_multiple_terms(pages):
+    results = pages.search("dough butter")
+    assert [result.request_path for result in results] == ["cookies", "bread"]
+
+
+def test_search_strips_markup(pages):
+    assert pages.search("extends") == []
+    assert pages.search("block") == []
+    assert [result.request_path for result in pages.search("knead")] == ["bread"]
+
+
+def test_search_limit(pages):
+    assert len(pages.search("cookie", limit=1)) == 1
+
+
+def test_search_no_match(pages):
+    assert pages.search("") == []
+    assert pages.search("chocolate") == []
+
+
+def test_search_common_terms(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    root = tmp_path / "pages"
+    root.mkdir()
+    for i in range(50):
+        (root / f"post-{i}.md").write_text("lorem " * (1 + i // 10) + f"ipsum{i % 10}")
+    pages = Pages(root)
+
+    # Common terms are only added to pages already matched by rare terms, but the
+    # scores are the same as scoring every term for every page
+    results = pages.search("lorem ipsum3", limit=3)
+    assert [result.request_path for result in results] == [
+        "post-3",
+        "post-13",
+        "post-23",
+    ]
+    expected = {}
+    for term in ["lorem", "ipsum3"]:
+        for result in pages.search(term, limit=50):
+            expected[result.request_path] = (
+                expected.get(result.request_path, 0) + result.score
+            )
+    for result in results:
+        assert result.score == pytest.approx(expected[result.request_path])
+
+
+def test_snippet(pages):
+    result = pages.search("butter")[0]
+    assert result.snippet == (
+        "Cream the <mark>butter</mark> and sugar. Bake the cookie dough. "
+        "Cool the cookies."
+    )
+    assert result.page.title == "Cookie recipe"
+
+
+def test_get_snippet():
+    text = "a " * 100 + "<target> " + "b " * 100
+    snippet = get_snippet(text, {"target"})
+    assert snippet.startswith("…")
+    assert snippet.endswith("…")
+    assert "&lt;<mark>target</mark>&gt;" in snippet
+
+
+def test_preload_search(pages, monkeypatch):
+    pages.preload_search = True
+    pages.preload(freeze=False)
+    assert len(pages.search_index) == 3
+
+    # Searches don't need to build the index
+    def refresh(snapshot=None):
+        raise AssertionError("Search index built by search")
+
+    monkeypatch.setattr(pages.search_index, "refresh", refresh)
+    assert [result.request_path for result in pages.search("knead")] == ["bread"]
+
+
+def test_incremental_update(pages):
+    assert len(pages.search("cookie")) == 2
+    search_index = pages.search_index
+    bread_id = search_index._doc_ids["bread"]
+
+    (pages.path / "cookies.md").unlink()
+    (pages.path / "cake.md").write_text("# Cake\n\nNot a cookie.")
+    pages.invalidate()
+
+    assert {result.request_path for result in pages.search("cookie")} == {"", "cake"}
+
+    # Unchanged pages are not re-indexed
+    assert pages.search_index is search_index
+    assert search_index._doc_ids["bread"] == bread_id
+    assert "cookies" not in search_index._doc_ids
+    assert "butter" not in search_index.postings
@@ -0,0 +1,128 @@
+import os
+import threading
+
+import pytest
+
+from django_nanopages.pages import Pages
+
+
+@pytest.fixture
+def releases(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    for release in ["r1", "r2"]:
+        path = tmp_path / "releases" / release
+        path.mkdir(parents=True)
+        (path / "index.md").write_text(f"# Home {release}")
+        (path / "about.md").write_text(f"# About {release}")
+    (tmp_path / "releases" / "r2" / "new.md").write_text("# New")
+    (tmp_path / "current").symlink_to(tmp_path / "releases" / "r1")
+    return tmp_path / "releases"
+
+
+def switch(link, target):
+    """
+    Atomically replace the symlink, as a deployment would
+    """
+    tmp_link = link.with_name("current.tmp")
+    tmp_link.symlink_to(target)
+    os.replace(tmp_link, link)
+
+
+@pytest.fixture
+def pages(releases):
+    return Pages("current", name="site", watch_release=True, release_check_interval=0)
+
+
+def test_snapshot__resolves_link(pages, releases):
+    assert pages.name == "site"
+    assert pages.path == releases / "r1"
+    assert pages.get_page("about").body == "# About r1"
+
+
+def test_release__loaded_in_background(pages, releases, monkeypatch):
+    version = pages.version
+    loading = threading.Event()
+    loaded = threading.Event()
+    warm = Pages.warm
+
+    def slow_warm(self, snapshot):
+        loading.set()
+        loaded.wait(5)
+        warm(self, snapshot)
+
+    monkeypatch.setattr(Pages, "warm", slow_warm)
+    switch(releases.parent / "current", releases / "r2")
+
+    # Old release served while the new one loads
+    page = pages.get_page("about")
+    assert loading.wait(5)
+    assert pages.get_page("about").body == "# About r1"
+    assert pages.get_page("new") is None
+
+    loaded.set()
+    pages.release_watcher.thread.join(5)
+
+    assert pages.path == releases / "r2"
+    assert pages.version == version + 1
+    assert pages.get_request_paths() == ["about", "new"]
+    assert pages.get_page("about").body == "# About r2"
+
+    # A page from the old release finishes with the old release
+    assert page.body == "# About r1"
+
+
+def test_release__warms_caches(pages, releases):
+    switch(releases.parent / "current", releases / "r2")
+    pages.index
+    pages.release_watcher.thread.join(5)
+
+    snapshot = pages.snapshot
+    assert snapshot.nav is not None
+    assert ("html", str(releases / "r2" / "new.md")) in pages.cache
+
+
+def test_release__builds_search_index(pages, releases):
+    assert pages.search("new") == []
+    search_index = pages.search_index
+
+    switch(releases.parent / "current", releases / "r2")
+    pages.index
+    pages.release_watcher.thread.join(5)
+
+    # A new index is built for the new release, and swapped in with it
+    assert pages.search_index is not search_index
+    assert not pages.search_index.stale
+    assert [result.request_path for result in pages.search("new")] == ["new"]
+
+
+def test_release__check_interval(releases):
+    pages = Pages(
+        "current", name="site", watch_release=True, release_check_interval=3600
+    )
+    switch(releases.parent / "current", releases / "r2")
+    pages.index
+    assert pages.release_watcher.thread is None
+    assert pages.path == releases / "r1"
+
+
+def test_release__failed(pages, releases, monkeypatch, caplog):
+    def fail(self, path):
+        raise ValueError("Broken release")
+
+    monkeypatch.setattr(Pages, "load_release", fail)
+    switch(releases.parent / "current", releases / "r2")
+    pages.index
+    pages.release_watcher.thread.join(5)
+
+    assert pages.path == releases / "r1"
+    assert "Could not load pages release" in caplog.text
+
+    # Not retried until the link changes again
+    thread = pages.release_watcher.thread
+    pages.index
+    assert pages.release_watcher.thread is thread
+
+
+def test_release__single_path_only(releases):
+    with pytest.raises(ValueError):
+        Pages(["current", "releases/r2"], watch_release=True)
@@ -0,0 +1,309 @@
+import shutil
+import tarfile
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, InMemoryStorage
+
+from django_nanopages.index import PageIndex
+from django_nanopages.pages import Pages
+from django_nanopages.sources import (
+    DirectorySource,
+    OverlaySource,
+    StorageSource,
+    TarSource,
+    ZipSource,
+    get_source,
+)
+
+
+FILES = {
+    "index.md": "# Home",
+    "about.html": "---\ntitle: About us\n---\n<h1>About</h1>",
+    "about.md": "# About",
+    "blog/index.md": "# Blog",
+    "blog/post.md": "---\ndate: 2026-01-01\n---\n# Post",
+    "logo.png": "",
+}
+
+
+@pytest.fixture
+def pages_dir(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    pages_path = tmp_path / "pages"
+    for name, content in FILES.items():
+        (pages_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (pages_path / name).write_text(content)
+    return pages_path
+
+
+@pytest.fixture
+def pages_zip(pages_dir):
+    path = pages_dir.parent / "pages.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        for name in FILES:
+            # Mix of compressed and uncompressed members
+            compress_type = zipfile.ZIP_DEFLATED if "blog" in name else None
+            archive.write(pages_dir / name, name, compress_type=compress_type)
+    return path
+
+
+@pytest.fixture
+def pages_tar(pages_dir):
+    path = pages_dir.parent / "pages.tar"
+    with tarfile.open(path, "w") as archive:
+        for name in FILES:
+            archive.add(pages_dir / name, name)
+    return path
+
+
+@pytest.fixture(params=["zip", "tar"])
+def pages_archive(request, pages_zip, pages_tar):
+    return {"zip": pages_zip, "tar": pages_tar}[request.param]
+
+
+def test_get_source(pages_dir, pages_zip, pages_tar):
+    assert isinstance(get_source(pages_dir), DirectorySource)
+    assert isinstance(get_source(pages_zip), ZipSource)
+    assert isinstance(get_source(pages_tar), TarSource)
+
+
+def test_archive_find(pages_archive):
+    source = get_source(pages_archive)
+    assert source.find("") == pages_archive / "index.md"
+    assert source.find("about") == pages_archive / "about.html"
+    assert source.find("blog") == pages_archive / "blog/index.md"
+    assert source.find("blog/post") == pages_archive / "blog/post.md"
+    assert source.find("missing") is None
+    assert source.find("logo") is None
+
+
+def test_archive_find_outside_root(pages_archive):
+    source = get_source(pages_archive)
+    assert source.find("../pages") is None
+    assert source.find("blog/../../pages") is None
+
+
+def test_archive_read(pages_archive):
+    source = get_source(pages_archive)
+    src = source.find("blog/post")
+    assert source.read_text(src) == FILES["blog/post.md"]
+    assert source.get_token(src)[1] == len(FILES["blog/post.md"])
+    assert source.is_file(src)
+    assert not source.is_file(pages_archive / "missing.md")
+
+
+def test_archive_replaced(pages_dir, pages_archive):
+    pages = Pages(pages_archive)
+    assert "blog/new" not in pages.get_request_paths()
+    old_snapshot = pages.snapshot
+
+    # Deploy a new archive alongside and move it into place
+    (pages_dir / "blog/new.md").write_text("# New")
+    new_path = pages_archive.with_name(f"new-{pages_archive.name}")
+    if pages_archive.suffix == ".zip":
+        with zipfile.ZipFile(new_path, "w") as archive:
+            archive.write(pages_dir / "blog/new.md", "blog/new.md")
+    else:
+        with tarfile.open(new_path, "w") as archive:
+            archive.add(pages_dir / "blog/new.md", "blog/new.md")
+    new_path.replace(pages_archive)
+
+    pages.invalidate()
+    assert pages.get_request_paths() == ["blog/new"]
+    assert pages.get_page("blog/new").body == "# New"
+
+    # Requests which started with the old archive can still read it
+    src = old_snapshot.index["blog/post"]
+    assert old_snapshot.source.read_text(src) == FILES["blog/post.md"]
+    assert not old_snapshot.source.mmap.closed
+
+    # Unchanged archive is not mapped again
+    source = pages.source
+    pages.invalidate()
+    assert pages.source is source
+
+
+def test_archive_pages(pages_archive):
+    pages = Pages(pages_archive)
+    assert pages.name == "pages"
+    assert pages.get_request_paths() == ["about", "blog", "blog/post"]
+
+    page = pages.get_page("about")
+    assert page.title == "About us"
+    assert page.as_html() == "<h1>About</h1>"
+    assert pages.get_page("blog/post").as_html() == "<h1>Post</h1>"
+    assert pages.get_page("missing") is None
+
+
+def test_archive_page_infos(pages_archive, pages_dir):
+    infos = Pages(pages_archive).get_page_infos(fields=["date"])
+    assert [info.request_path for info in infos] == ["", "about", "blog", "blog/post"]
+    assert infos[3].date == "2026-01-01"
+    assert infos[3].size == len(FILES["blog/post.md"])
+
+
+@pytest.fixture
+def pages_storage():
+    storage = InMemoryStorage()
+    for name, content in FILES.items():
+        storage.save(name, ContentFile(content.encode()))
+    return storage
+
+
+def test_get_source_storage(pages_storage):
+    assert isinstance(get_source(pages_storage), StorageSource)
+
+
+def test_storage_find(pages_storage):
+    source = StorageSource(pages_storage)
+    assert source.find("") == Path("index.md")
+    assert source.find("about") == Path("about.html")
+    assert source.find("blog") == Path("blog/index.md")
+    assert source.find("blog/post") == Path("blog/post.md")
+    assert source.find("missing") is None
+    assert source.find("../blog/post") is None
+
+
+def test_storage_listing_cached(pages_storage):
+    source = StorageSource(pages_storage)
+    assert source.find("new") is None
+
+    pages_storage.save("new.md", ContentFile(b"# New"))
+    assert source.find("new") is None
+
+    source.invalidate()
+    assert source.find("new") == Path("new.md")
+
+
+def test_storage_read(pages_storage):
+    source = StorageSource(pages_storage)
+    src = source.find("blog/post")
+    assert source.read_text(src) == FILES["blog/post.md"]
+    assert source.get_token(src)[1] == len(FILES["blog/post.md"])
+
+
+def test_storage_prefetch(pages_storage):
+    source = StorageSource(pages_storage, prefetch_workers=2)
+    srcs = [src for _, src in source.scan()]
+    source.prefetch(srcs)
+    assert all(source.members[src.as_posix()] is not None for src in srcs)
+
+    # Prefetched content is read without opening the file again
+    with patch.object(pages_storage, "open") as mock_open:
+        assert source.read_text(Path("blog/post.md")) == FILES["blog/post.md"]
+    mock_open.assert_not_called()
+
+
+def test_storage_pages(pages_storage):
+    pages = Pages(pages_storage, name="content")
+    assert pages.get_request_paths() == ["about", "blog", "blog/post"]
+    assert pages.get_page("about").as_html() == "<h1>About</h1>"
+    assert pages.get_page("missing") is None
+
+    stats = pages.preload(freeze=False)
+    assert stats["entries"] == 7
+
+    # Pages which were already cached aren't fetched, so nothing is left over
+    assert pages.source._prefetched == {}
+
+
+def test_storage_pages_requires_name(pages_storage):
+    with pytest.raises(ValueError):
+        Pages(pages_storage)
+
+
+def test_filesystem_storage_pages(pages_dir):
+    pages = Pages(FileSystemStorage(pages_dir), name="content")
+    assert pages.get_page("blog/post").as_html() == "<h1>Post</h1>"
+
+
+@pytest.fixture
+def overlay_dirs(pages_dir):
+    base = pages_dir
+    override = pages_dir.parent / "override"
+    (override / "blog").mkdir(parents=True)
+    # Replaces about.html in the base, even though .html would normally win
+    (override / "about.md").write_text("# Overridden")
+    (override / "blog/new.md").write_text("# New")
+    return base, override
+
+
+def test_overlay_source(overlay_dirs):
+    base, override = overlay_dirs
+    source = OverlaySource([get_source(base), get_source(override)])
+
+    assert source.find("about") == override / "about.md"
+    assert source.find("blog/post") == base / "blog/post.md"
+    assert source.find("blog/new") == override / "blog/new.md"
+    assert source.find("missing") is None
+    assert source.read_text(override / "about.md") == "# Overridden"
+    assert source.get_owner(base / "index.md").path == base
+
+
+def test_overlay_index(overlay_dirs):
+    base, override = overlay_dirs
+    source = OverlaySource([get_source(base), get_source(override)])
+
+    index = PageIndex.build(source)
+    assert dict(index) == {
+        "": base / "index.md",
+        "about": override / "about.md",
+        "blog": base / "blog/index.md",
+        "blog/new": override / "blog/new.md",
+        "blog/post": base / "blog/post.md",
+    }
+
+
+def test_overlay_pages(overlay_dirs):
+    base, override = overlay_dirs
+    pages = Pages(["pages", override])
+
+    assert pages.name == "pages"
+    assert pages.paths == [base, override]
+    assert pages.get_request_paths() == ["about", "blog", "blog/new", "blog/post"]
+    assert pages.get_page("about").body == "# Overridden"
+    assert pages.get_page("blog/post").title == "Post"
+
+
+def test_overlay_pages_archive(overlay_dirs, pages_zip):
+    _, override = overlay_dirs
+    pages = Pages([pages_zip, override])
+
+    assert isinstance(pages.source, OverlaySource)
+    assert pages.get_page("about").body == "# Overridden"
+    assert pages.get_page("blog/post").src == pages_zip / "blog/post.md"
+
+    # A replaced archive layer gives a new overlay, unchanged layers are kept
+    source = pages.source
+    pages.invalidate()
+    assert pages.source is source
+    new_path = pages_zip.with_name("new.zip")
+    shutil.copy(pages_zip, new_path)
+    with zipfile.ZipFile(new_path, "a") as archive:
+        archive.writestr("blog/extra.md", "# Extra")
+    new_path.replace(pages_zip)
+    pages.invalidate()
+    assert pages.source is not source
+    assert pages.source.sources[1] is source.sources[1]
+    assert pages.get_page("blog/extra").body == "# Extra"
+
+
+def test_overlay_pages_storages(pages_storage):
+    override = InMemoryStorage()
+    override.save("about.md", ContentFile(b"# Overridden"))
+    override.save("blog/new.md", ContentFile(b"# New"))
+    pages = Pages([pages_storage, override], name="content")
+
+    assert pages.get_request_paths() == ["about", "blog", "blog/new", "blog/post"]
+    assert pages.get_page("blog/post").as_html() == "<h1>Post</h1>"
+    assert pages.get_page("about").as_html() == "<h1>Overridden</h1>"
+    assert pages.get_page("blog/new").as_html() == "<h1>New</h1>"
+    assert len(pages.get_page_infos()) == 5
+
+    # Owners are found again after invalidating, before the index is rebuilt
+    pages.invalidate()
+    assert pages.source.read_text(Path("blog/post.md")) == FILES["blog/post.md"]
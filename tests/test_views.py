@@ -5,8 +5,10 @@ import pytest
 from django.http import Http404, HttpResponse
 from django.test import RequestFactory
 
+from django_nanopages.cache import PageCache
 from django_nanopages.page import Page
 from django_nanopages.pages import Pages
+from django_nanopages.sources import DirectorySource
 from django_nanopages.views import PageView
 
 
@@ -15,6 +17,9 @@ def page_view(tmp_path):
     page_view = PageView()
     page_view.pages = MagicMock()
     page_view.pages.path = tmp_path
+    page_view.pages.cache = PageCache()
+    page_view.pages.source = DirectorySource(tmp_path)
+    page_view.pages.markdown_pool = None
     page_view.request = RequestFactory().get("/")
     return page_view
 